@@ -0,0 +1,46 @@
+import time
+import tracemalloc
+import numpy as np
+
+from dronehover.allocation import Allocator
+from dronehover.optimization import Hover
+
+from designs import ring
+
+
+if __name__ == "__main__":
+    num_commands = 100000
+    rng = np.random.default_rng(0)
+
+    for name, drone in {"quad": ring(4), "octo tilted": ring(8, tilt=0.2), "dodeca tilted": ring(12, tilt=0.3)}.items():
+        sim = Hover(drone)
+        sim.compute_hover(seed=0)
+        allocator = Allocator(sim)
+
+        # Commands around hover, some large enough to saturate
+        f0 = sim.Bf @ sim.eta
+        forces = f0 + rng.normal(scale=3, size=(num_commands, 3))
+        torques = rng.normal(scale=50, size=(num_commands, 3))
+        out = np.empty(sim.num_props)
+
+        for i in range(1000):   # warm up
+            allocator.allocate(forces[i], torques[i], out)
+
+        latency = np.empty(num_commands)
+        for i in range(num_commands):
+            t0 = time.perf_counter_ns()
+            allocator.allocate(forces[i], torques[i], out)
+            latency[i] = time.perf_counter_ns() - t0
+
+        tracemalloc.start()
+        for i in range(1000):
+            allocator.allocate(forces[i], torques[i], out)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        t0 = time.perf_counter()
+        allocator.allocate_batch(forces, torques)
+        batch = (time.perf_counter() - t0) / num_commands
+
+        print(f"{name:<16}p50 {np.percentile(latency, 50)/1e3:6.2f} us   p99 {np.percentile(latency, 99)/1e3:6.2f} us   "
+              f"batch {batch*1e6:6.3f} us/command   retained memory {current} B")
@@ -0,0 +1,43 @@
+import time
+import numpy as np
+
+from dronehover.bodies.standard_bodies import Quadcopter, Hexacopter, Octacopter
+from dronehover.initial_guess import WarmStartIndex
+from dronehover.optimization import Hover
+
+from designs import ring, random_design
+
+
+def run(drones, init, seeds, static_method):
+    nfev, nit, wall, cost = [], [], [], []
+    for drone in drones:
+        for seed in seeds:
+            sim = Hover(drone)
+            t0 = time.perf_counter()
+            result = sim.compute_hover(seed=seed, static_method=static_method, init=init)
+            wall.append(time.perf_counter() - t0)
+            nfev.append(sum(phase["nfev"] for phase in result.phases.values()))
+            nit.append(sum(phase["nit"] for phase in result.phases.values()))
+            cost.append(np.nan if result.input_cost is None else result.input_cost)
+    return np.mean(nfev), np.mean(nit), np.mean(wall)*1e3, np.nanmean(cost)
+
+
+if __name__ == "__main__":
+    seeds = range(5)
+    cases = {"standard": [Quadcopter(0.2), Hexacopter(0.2), Octacopter(0.2)],
+             "quad spinning": [ring(4, spin=["ccw"]*4)],
+             "random 6": [random_design(6, seed) for seed in range(10)],
+             "random 10": [random_design(10, seed) for seed in range(10)]}
+
+    print(f"{'case':<16}{'static':<11}{'init':<11}{'nfev':>8}{'nit':>8}{'ms':>10}{'cost':>10}")
+    for name, drones in cases.items():
+        for static_method in ("slsqp", "nullspace"):
+            for init in ("random", "min_norm", "symmetric"):
+                nfev, nit, ms, cost = run(drones, init, seeds, static_method)
+                print(f"{name:<16}{static_method:<11}{init:<11}{nfev:>8.1f}{nit:>8.1f}{ms:>10.2f}{cost:>10.5f}")
+
+    # Nearest neighbour warm start along a family of similar designs
+    drones = [ring(6, tilt=tilt) for tilt in np.linspace(0, 0.5, 26)]
+    for name, init in (("random", "random"), ("min_norm", "min_norm"), ("neighbour", WarmStartIndex())):
+        nfev, nit, ms, cost = run(drones, init, [0], "slsqp")
+        print(f"{'ring 6 tilts':<16}{'slsqp':<11}{name:<11}{nfev:>8.1f}{nit:>8.1f}{ms:>10.2f}{cost:>10.5f}")
@@ -0,0 +1,33 @@
+import time
+import numpy as np
+
+from dronehover.optimization import Hover
+
+from designs import ring
+
+
+def run(drone, jac, seeds):
+    nfev, nit, wall, success = [], [], [], []
+    for seed in seeds:
+        sim = Hover(drone)
+        t0 = time.perf_counter()
+        result = sim.compute_hover(jac=jac, seed=seed, static_method="slsqp")
+        wall.append(time.perf_counter() - t0)
+        nfev.append(sum(phase["nfev"] for phase in result.phases.values()))
+        nit.append(sum(phase["nit"] for phase in result.phases.values()))
+        success.append(sim.hover_status != "N")
+    return np.mean(nfev), np.mean(nit), np.mean(wall)*1e3, np.mean(success)
+
+
+if __name__ == "__main__":
+    seeds = range(10)
+    cases = {"quad": ring(4),
+             "octo tilted": ring(8, tilt=0.2),
+             "dodeca tilted": ring(12, tilt=0.3),
+             "quad spinning": ring(4, spin=["ccw"]*4)}
+    
+    print(f"{'case':<16}{'jac':<8}{'nfev':>8}{'nit':>8}{'ms':>10}{'success':>10}")
+    for name, drone in cases.items():
+        for jac in (False, True):
+            nfev, nit, ms, success = run(drone, jac, seeds)
+            print(f"{name:<16}{str(jac):<8}{nfev:>8.1f}{nit:>8.1f}{ms:>10.2f}{success:>10.2f}")
@@ -0,0 +1,49 @@
+"""Compares two benchmark JSON files written by run_benchmarks.py.
+
+    python benchmarks/compare.py old.json new.json --threshold 1.2
+"""
+import argparse
+import json
+
+
+def flatten(results, prefix=""):
+    values = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark results")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="ratio above which a time or evaluation count is a regression")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = flatten(json.load(f)["results"])
+    with open(args.new) as f:
+        new = flatten(json.load(f)["results"])
+
+    regressions = 0
+    for key in sorted(set(old) & set(new)):
+        if old[key] == 0:
+            continue
+        ratio = new[key] / old[key]
+        # Higher is worse for everything except success rates. Counts of each hover status
+        # (solve.status.*) have no better direction and are only reported.
+        if ".status." in key:
+            worse = False
+        elif key.endswith("success_rate"):
+            worse = ratio < 1/args.threshold
+        else:
+            worse = ratio > args.threshold
+        flag = "REGRESSION" if worse else ""
+        regressions += worse
+        print(f"{key:<48}{old[key]:>14.6g}{new[key]:>14.6g}{ratio:>8.2f}  {flag}")
+
+    print(f"{regressions} regressions")
+    raise SystemExit(1 if regressions else 0)
@@ -0,0 +1,39 @@
+import numpy as np
+from numpy import sin, cos, pi
+
+from dronehover.bodies.custom_bodies import Custombody
+
+
+def ring_props(num_props, length=0.2, tilt=0.0, spin=None):
+    """Ring of propellers with alternating (or given) rotation and radial tilt."""
+    if spin is None:
+        spin = ["ccw", "cw"] * (num_props // 2) + ["ccw"] * (num_props % 2)
+    props = []
+    for i in range(num_props):
+        psi = 2*pi*i/num_props
+        props.append({"loc": [length*cos(psi), length*sin(psi), 0],
+                      "dir": [sin(tilt)*cos(psi), sin(tilt)*sin(psi), -cos(tilt), spin[i]],
+                      "propsize": 5})
+    return props
+
+
+def ring(num_props, length=0.2, tilt=0.0, spin=None):
+    return Custombody(ring_props(num_props, length, tilt, spin))
+
+
+def random_props(num_props, rng, max_tilt=0.5):
+    """Random propeller layout with tilted thrust directions and random rotation."""
+    props = []
+    for _ in range(num_props):
+        psi = rng.uniform(0, 2*pi)
+        length = rng.uniform(0.08, 0.3)
+        tilt = rng.uniform(0, max_tilt)
+        tilt_dir = rng.uniform(0, 2*pi)
+        props.append({"loc": [length*cos(psi), length*sin(psi), rng.uniform(-0.02, 0.02)],
+                      "dir": [sin(tilt)*cos(tilt_dir), sin(tilt)*sin(tilt_dir), -cos(tilt), str(rng.choice(["ccw", "cw"]))],
+                      "propsize": 5})
+    return props
+
+
+def random_design(num_props, seed, max_tilt=0.5):
+    return Custombody(random_props(num_props, np.random.default_rng(seed), max_tilt))
@@ -0,0 +1,142 @@
+"""Benchmark suite for dronehover.
+
+Times body construction, Hover.__init__ and compute_hover on standard bodies and seeded
+random N-rotor designs, and writes the results as JSON so that versions can be compared
+with compare.py.
+
+    python benchmarks/run_benchmarks.py --output bench.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+import scipy
+
+from dronehover.bodies import standard_bodies
+from dronehover.bodies.custom_bodies import Custombody
+from dronehover.optimization import Hover
+
+from designs import ring_props, random_props
+
+
+def measure(fn, repeats):
+    """Runs fn repeatedly and returns the median wall time, the peak traced memory and the last return value."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(np.median(times)), peak, value
+
+
+def solve_stats(drone, seeds, **kwargs):
+    """Solves a design once per seed and collects timings, SLSQP evaluations and success rate."""
+    times, nfev, nit, status = [], [], [], []
+    sim = Hover(drone)
+    for seed in seeds:
+        t0 = time.perf_counter()
+        result = sim.compute_hover(seed=seed, **kwargs)
+        times.append(time.perf_counter() - t0)
+        nfev.append(sum(phase["nfev"] for phase in result.phases.values()))
+        nit.append(sum(phase["nit"] for phase in result.phases.values()))
+        status.append(sim.hover_status)
+
+    tracemalloc.start()
+    sim.compute_hover(seed=seeds[0], **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    statuses, counts = np.unique(status, return_counts=True)
+    return {"time_median": float(np.median(times)),
+            "time_max": float(np.max(times)),
+            "nfev_mean": float(np.mean(nfev)),
+            "nit_mean": float(np.mean(nit)),
+            "status": {str(s): int(c) for s, c in zip(statuses, counts)},
+            "success_rate": float(np.mean([s != "N" for s in status])),
+            "peak_memory": peak}
+
+
+def infeasible_props():
+    """Quadcopter which is far too heavy to hover, used with a mass override."""
+    return ring_props(4)
+
+
+def run(seeds, repeats, sizes):
+    results = {}
+
+    # Standard bodies
+    for name in ["Quadcopter", "Tricopter", "Hexacopter", "Octacopter"]:
+        body = getattr(standard_bodies, name)
+        try:
+            t_body, m_body, drone = measure(lambda: body(0.2), repeats)
+        except Exception as e:
+            results[f"standard/{name}"] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        t_init, m_init, _ = measure(lambda: Hover(drone), repeats)
+        results[f"standard/{name}"] = {"body_time": t_body, "body_peak_memory": m_body,
+                                       "init_time": t_init, "init_peak_memory": m_init,
+                                       "solve": solve_stats(drone, seeds)}
+
+    # Hover modes
+    cases = {"static": Custombody(ring_props(4)),
+             "spinning": Custombody(ring_props(4, spin=["ccw"]*4)),
+             "infeasible": Custombody(infeasible_props(), mass=20, cg=[0, 0, 0], Ix=0.01, Iy=0.01, Iz=0.02, Ixy=0, Ixz=0, Iyz=0)}
+    for name, drone in cases.items():
+        results[f"mode/{name}"] = {"solve": solve_stats(drone, seeds)}
+
+    # Random N-rotor designs with tilted thrust directions
+    for num_props in sizes:
+        props = [random_props(num_props, np.random.default_rng([num_props, seed])) for seed in seeds]
+        t_body, m_body, _ = measure(lambda: [Custombody(p) for p in props], repeats)
+        drones = [Custombody(p) for p in props]
+        t_init, m_init, _ = measure(lambda: [Hover(d) for d in drones], repeats)
+
+        per_design = [solve_stats(drone, seeds[:1]) for drone in drones]
+        results[f"random/{num_props}"] = {"body_time": t_body/len(props), "body_peak_memory": m_body,
+                                          "init_time": t_init/len(drones), "init_peak_memory": m_init,
+                                          "solve": {"time_median": float(np.median([s["time_median"] for s in per_design])),
+                                                    "time_max": float(np.max([s["time_max"] for s in per_design])),
+                                                    "nfev_mean": float(np.mean([s["nfev_mean"] for s in per_design])),
+                                                    "nit_mean": float(np.mean([s["nit_mean"] for s in per_design])),
+                                                    "success_rate": float(np.mean([s["success_rate"] for s in per_design])),
+                                                    "peak_memory": int(np.max([s["peak_memory"] for s in per_design]))}}
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "scipy": scipy.__version__, "machine": platform.machine()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the dronehover benchmark suite")
+    parser.add_argument("--output", default="bench_output.json", help="JSON output file")
+    parser.add_argument("--seeds", type=int, default=10, help="number of seeds per case")
+    parser.add_argument("--repeats", type=int, default=5, help="timing repeats for construction benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 6, 8, 12, 16], help="propeller counts of random designs")
+    args = parser.parse_args()
+
+    results = run(list(range(args.seeds)), args.repeats, args.sizes)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<24}{result['error']}")
+            continue
+        solve = result["solve"]
+        print(f"{name:<24}{solve['time_median']*1e3:>9.2f} ms{solve['nfev_mean']:>9.1f} nfev{solve['nit_mean']:>8.1f} nit"
+              f"{solve['success_rate']:>7.2f} success{solve['peak_memory']/1024:>9.1f} KiB")
@@ -1,9 +1,11 @@
 from . import *
 
-prop_lib = {
-            # "prop4": {"constants": [7.24e-07, 8.20e-09], "wmax": 3927, "mass": 0.018}, 
-            "prop5": {"constants": [1.08E-06, 1.22E-08], "wmax": 3142, "mass": 0.0335}, 
-            # "prop6": {"constants": [2.21E-06, 2.74E-08], "wmax": 2618, "mass": 0.0252}, 
-            # "prop7": {"constants": [4.65E-06, 6.62E-08], "wmax": 2244, "mass": 0.046},
-            # "prop8": {"constants": [7.60E-06, 1.14E-07], "wmax": 1963, "mass": 0.056}
-}
\ No newline at end of file
+
+def __getattr__(name):
+    # prop_lib is derived from the default propeller library (see dronehover.proplib), so that it cannot diverge from it.
+    # Deprecated, use dronehover.proplib.default_library instead.
+    if name == "prop_lib":
+        from dronehover.proplib import default_library
+        return {str(row["name"]): {"constants": [float(row["kf"]), float(row["km"])], "wmax": float(row["wmax"]), "mass": float(row["mass"])}
+                for row in default_library().table}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,5 @@
+import sys
+
+from dronehover.cli import main
+
+sys.exit(main())
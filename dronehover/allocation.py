@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class Allocator:
+    def __init__(self, hover, weights=None, output_weights=None, iterations=8, tol=1e-9, rcond=1e-10, max_cached=256):
+        """Control allocator mapping desired specific force and torque to motor commands around a hover solution.
+
+           Allocation uses a redistributed pseudo-inverse of B = [Bf; Bm]. Starting from the hover inputs, the inputs
+           move along the weighted pseudo-inverse solution of the remaining command until it is met or a motor reaches
+           its limit (hover.control_limits, so limited or degraded motors are respected). Motors at their limits are
+           frozen and the remaining command is redistributed with the pseudo-inverse of the columns of the free motors,
+           at most iterations times. No step increases the weighted error, so saturated commands are never allocated
+           worse than the hover inputs. Pseudo-inverses are cached per set of free motors. Force and torque rows are
+           scaled by output_weights, so that neither dominates the least squares error when the command cannot be met.
+
+        Args:
+            hover (Hover): Hover optimizer after compute_hover, with a hovering solution.
+            weights (ndarray, optional): Positive weight of each propeller, larger weights are used less. Defaults to hover.W.
+            output_weights (ndarray, optional): Weight of each row of [force; torque], shape (6,).
+                                                Defaults to 1/norm(Bf) for the force rows and 1/norm(Bm) for the torque rows.
+            iterations (int, optional): Maximum number of steps, each freezing at least one motor. Defaults to 8.
+            tol (float, optional): Relative step tolerance within which motors reach their limits together. Defaults to 1e-9.
+            rcond (float, optional): Cutoff of small singular values of the pseudo-inverses. Defaults to 1e-10.
+            max_cached (int, optional): Maximum number of cached pseudo-inverses. Defaults to 256.
+
+        Raises:
+            ValueError: Hover optimizer has no hovering solution.
+        """
+        if getattr(hover, "hover_status", None) not in ("ST", "SP"):
+            raise ValueError("Allocator requires a hovering solution, run compute_hover first")
+
+        self.num_props = hover.num_props
+        self.iterations = iterations
+        self.tol = tol
+        self.rcond = rcond
+        self.max_cached = max_cached
+
+        self.B = np.ascontiguousarray(np.vstack([hover.Bf, hover.Bm]))
+        W = np.diag(hover.W) if weights is None else np.asarray(weights, dtype=float)
+        self.w_inv_sqrt = 1/np.sqrt(W)
+        if output_weights is None:
+            output_weights = np.repeat([1/max(np.linalg.norm(hover.Bf), 1e-300), 1/max(np.linalg.norm(hover.Bm), 1e-300)], 3)
+        self.output_weights = np.asarray(output_weights, dtype=float)
+
+        # Weighted pseudo-inverses of the scaled rows, minimizing delta.T @ diag(W) @ delta, by set of free motors
+        self._pinv_cache = {}
+        self.all_free = np.ones(self.num_props, dtype=bool)
+        self.pinv = self.free_pinv(self.all_free)
+
+        self.eta0 = np.array(hover.eta, dtype=float)
+        self.v0 = self.B @ self.eta0
+        # Per-motor bounds of eta from the angular velocity limits of each motor
+        self.lb = np.ascontiguousarray(hover.control_limits[:, 0]**2)
+        self.ub = np.ascontiguousarray(hover.control_limits[:, 1]**2)
+        self.w_min = hover.w_hat_bounds[0]
+        self.w_range = 1 - hover.w_hat_bounds[0]
+
+        # Preallocated buffers
+        self._v = np.empty(6)
+        self._r = np.empty(6)
+        self._Beta = np.empty(6)
+        self._eta = np.empty(self.num_props)
+        self._u = np.empty(self.num_props)
+        self._d = np.empty(self.num_props)
+        self._t = np.empty(self.num_props)
+        self._free = np.empty(self.num_props, dtype=bool)
+
+    def free_pinv(self, free):
+        """Weighted pseudo-inverse mapping a command residual (6,) to the deviation of the free motors, shape (F, 6)."""
+        key = free.tobytes()
+        pinv = self._pinv_cache.get(key)
+        if pinv is None:
+            if len(self._pinv_cache) >= self.max_cached:
+                self._pinv_cache.clear()
+            w = self.w_inv_sqrt[free]
+            B = self.B[:, free] * self.output_weights[:, np.newaxis]
+            pinv = np.ascontiguousarray(w[:, np.newaxis] * np.linalg.pinv(B * w, rcond=self.rcond) * self.output_weights)
+            self._pinv_cache[key] = pinv
+        return pinv
+
+    def allocate(self, force, torque, out=None):
+        """Computes motor commands for a desired specific force and specific torque (angular acceleration).
+
+        Args:
+            force (ndarray): Desired specific force in body axis, shape (3,).
+            torque (ndarray): Desired angular acceleration in body axis, shape (3,).
+            out (ndarray, optional): Output array of shape (P,). Defaults to an internal buffer, overwritten by the next call.
+
+        Returns:
+            ndarray: Motor commands u in [0, 1], shape (P,).
+        """
+        self._v[:3] = force
+        self._v[3:] = torque
+        eta = self.solve(self._v)
+
+        u = self._u if out is None else out
+        np.sqrt(eta, out=u)
+        u -= self.w_min
+        u /= self.w_range
+        return u
+
+    def solve(self, v):
+        """Computes bounded inputs eta for a stacked command v = [force, torque], shape (6,).
+           Returns an internal buffer which is overwritten by the next call.
+        """
+        eta = self._eta
+        d = self._d
+        free = self._free
+        eta[:] = self.eta0
+        np.subtract(v, self.v0, out=self._r)
+        np.dot(self.pinv, self._r, out=d)
+        free.fill(True)
+
+        for _ in range(self.iterations):
+            # Largest step towards the least squares solution which keeps the free motors within their limits
+            np.divide(np.where(d > 0, self.ub, self.lb) - eta, d, out=self._t, where=d != 0)
+            self._t[(d == 0) | ~free] = np.inf
+            t = min(self._t.min(), 1.0)
+            eta += t * d
+            if t >= 1.0:
+                break
+
+            # Freeze the motors which reached their limits and redistribute the remaining command to the others
+            free &= self._t > t + self.tol
+            np.clip(eta, self.lb, self.ub, out=eta)
+            if not free.any():
+                break
+            np.dot(self.B, eta, out=self._Beta)
+            np.subtract(v, self._Beta, out=self._r)
+            d.fill(0.0)
+            d[free] = self.free_pinv(free) @ self._r
+
+        np.clip(eta, self.lb, self.ub, out=eta)
+        return eta
+
+    def allocate_batch(self, force, torque):
+        """Computes motor commands for many commands at once, with the same redistribution as allocate.
+
+        Args:
+            force (ndarray): Desired specific forces, shape (M, 3).
+            torque (ndarray): Desired angular accelerations, shape (M, 3).
+
+        Returns:
+            ndarray: Motor commands, shape (M, P).
+        """
+        v = np.concatenate([np.asarray(force, dtype=float), np.asarray(torque, dtype=float)], axis=1)
+        eta = np.tile(self.eta0, (len(v), 1))
+        d = (v - self.v0) @ self.pinv.T
+        free = np.ones(eta.shape, dtype=bool)
+        active = np.arange(len(v))
+
+        for _ in range(self.iterations):
+            e, dd, f = eta[active], d[active], free[active]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                limit = (np.where(dd > 0, self.ub, self.lb) - e) / dd
+            limit[(dd == 0) | ~f] = np.inf
+            t = np.minimum(limit.min(axis=1), 1.0)
+            eta[active] = e + t[:, np.newaxis] * dd
+
+            saturated = t < 1.0
+            active, t, limit = active[saturated], t[saturated], limit[saturated]
+            if not active.size:
+                break
+            free[active] &= limit > t[:, np.newaxis] + self.tol
+            eta[active] = np.clip(eta[active], self.lb, self.ub)
+
+            # Commands with the same free motors share one pseudo-inverse
+            r = v[active] - eta[active] @ self.B.T
+            d[active] = 0.0
+            sets, group = np.unique(free[active], axis=0, return_inverse=True)
+            for k, fk in enumerate(sets):
+                if fk.any():
+                    m = active[group.ravel() == k]
+                    d[np.ix_(m, np.flatnonzero(fk))] = r[group.ravel() == k] @ self.free_pinv(fk).T
+
+        np.clip(eta, self.lb, self.ub, out=eta)
+        u = np.sqrt(eta, out=eta)
+        u -= self.w_min
+        u /= self.w_range
+        return u
@@ -0,0 +1,68 @@
+from itertools import combinations
+import numpy as np
+
+
+def attainable_set(B, w_hat_bounds=(0.02, 1), point=None, tol=1e-9):
+    """Computes the attainable set {B @ eta : eta within its bounds} of effectiveness matrices.
+
+       The image of the input box is a zonotope with center c = B @ (lb + ub)/2 and one generator
+       g_j = B[:, j] * (ub - lb)/2 per propeller, so its convex hull follows from the generators instead of
+       the 2^P box corners. In 3D every facet is normal to the cross product n of two generators, with
+       support n @ c + sum_k |n @ g_k| in direction n (and likewise for -n), and the volume is
+       8 * sum over generator triples of |det(g_i, g_j, g_k)|. Leading dimensions of B are treated as a batch.
+
+    Args:
+        B (ndarray): Effectiveness matrices (Bf or Bm), shape (..., 3, P).
+        w_hat_bounds (tuple, optional): Bounds of the normalized angular velocities. Defaults to (0.02, 1).
+        point (ndarray, optional): Point from which the margin is measured, e.g. B @ eta at hover, shape (..., 3).
+                                   Defaults to None, giving a NaN margin.
+        tol (float, optional): Cross products shorter than tol times the largest are treated as parallel generators.
+                               Defaults to 1e-9.
+
+    Returns:
+        dict: "center" (..., 3), "normals" (..., F, 3) unit facet normals and "offsets" (..., F) such that the set is
+              normals @ x <= offsets, "volume" (...,) and "margin" (...,), the smallest distance from the point to a
+              facet (negative outside the set). Normals of parallel generator pairs are zero with infinite offsets.
+              Sets of rank below 3 have zero volume and a margin of at most zero.
+    """
+    B = np.asarray(B, dtype=float)
+    num_props = B.shape[-1]
+    lb = w_hat_bounds[0]**2
+    ub = w_hat_bounds[1]**2
+
+    center = B.sum(axis=-1) * (lb + ub)/2
+    generators = np.swapaxes(B, -1, -2) * (ub - lb)/2      # (..., P, 3)
+
+    # Facet normals from all generator pairs, both orientations
+    i, j = np.array(list(combinations(range(num_props), 2)), dtype=int).reshape(-1, 2).T
+    normals = np.cross(generators[..., i, :], generators[..., j, :])
+    normals = np.concatenate([normals, -normals], axis=-2)
+    length = np.linalg.norm(normals, axis=-1)
+    scale = np.max(length, axis=-1, keepdims=True)
+    valid = length > tol*scale
+    normals = np.where(valid[..., np.newaxis], normals / np.where(valid, length, 1)[..., np.newaxis], 0)
+
+    support = np.abs(normals @ np.swapaxes(generators, -1, -2)).sum(axis=-1)
+    offsets = np.einsum("...fi,...i->...f", normals, center) + support
+    offsets = np.where(valid, offsets, np.inf)
+
+    # Volume from all generator triples
+    triples = np.array(list(combinations(range(num_props), 3)), dtype=int).reshape(-1, 3)
+    if triples.size:
+        volume = 8 * np.abs(np.linalg.det(np.stack([generators[..., triples[:, k], :] for k in range(3)], axis=-2))).sum(axis=-1)
+    else:
+        volume = np.zeros(B.shape[:-2])
+
+    if point is None:
+        margin = np.full(B.shape[:-2], np.nan)
+    else:
+        point = np.asarray(point, dtype=float)
+        distance = offsets - np.einsum("...fi,...i->...f", normals, point)
+        margin = np.min(distance, axis=-1)
+        # Flat sets have no interior
+        if np.ndim(margin):
+            margin = np.where(volume > 0, margin, np.minimum(margin, 0))
+        elif volume == 0:
+            margin = min(margin, 0)
+
+    return {"center": center, "normals": normals, "offsets": offsets, "volume": volume, "margin": margin}
@@ -0,0 +1,218 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from dronehover.bodies.custom_bodies import body_inertia
+from dronehover.optimization import BatchHover
+from dronehover.proplib import get_library
+
+# Validation error codes, one bit per check
+ERRORS = {1: "non-finite propeller location or mounting point",
+          2: "zero or non-finite thrust direction",
+          4: "rotation must be -1 (ccw) or 1 (cw)",
+          8: "propeller size outside the propeller library",
+          16: "mass must be positive and inertia symmetric positive definite"}
+
+
+def design_dtype(num_props):
+    """Fixed-width record of a drone design with num_props propellers.
+       mass, cg and inertia are NaN for designs whose inertial properties are computed from the propellers
+       (as Custombody without inertia overrides).
+    """
+    return np.dtype([("loc", "f8", (num_props, 3)),
+                     ("dir", "f8", (num_props, 3)),
+                     ("rot", "i1", (num_props,)),
+                     ("propsize", "f8", (num_props,)),
+                     ("mountpoints", "f8", (num_props, 3)),
+                     ("mass", "f8"),
+                     ("cg", "f8", (3,)),
+                     ("inertia", "f8", (3, 3))])
+
+
+def result_dtype(num_props):
+    """Record of the hover result of a design. status is empty and error non-zero for invalid designs."""
+    return np.dtype([("status", "U2"),
+                     ("alpha", "f8"),
+                     ("input_cost", "f8"),
+                     ("u", "f8", (num_props,)),
+                     ("error", "u1")])
+
+
+def create(path, num_designs, num_props):
+    """Creates a memory-mapped design file filled with automatically computed inertia (NaN) and zero mounting points.
+
+    Returns:
+        memmap: Writable design array of shape (num_designs,).
+    """
+    designs = open_memmap(path, mode="w+", dtype=design_dtype(num_props), shape=(num_designs,))
+    designs["mass"] = np.nan
+    designs["cg"] = np.nan
+    designs["inertia"] = np.nan
+    return designs
+
+
+def from_payloads(payloads, path):
+    """Writes designs in the dictionary format of Custombody (see cli.design_from_dict) to a design file.
+
+    Raises:
+        ValueError: Designs do not have the same number of propellers.
+    """
+    payloads = list(payloads)
+    num_props = {len(payload["props"]) for payload in payloads}
+    if len(num_props) != 1:
+        raise ValueError("All designs in a design file must have the same number of propellers")
+
+    designs = create(path, len(payloads), num_props.pop())
+    for i, payload in enumerate(payloads):
+        props = payload["props"]
+        designs["loc"][i] = [prop["loc"] for prop in props]
+        designs["dir"][i] = [prop["dir"][:3] for prop in props]
+        designs["rot"][i] = [-1 if prop["dir"][-1] == "ccw" else 1 for prop in props]
+        designs["propsize"][i] = [prop["propsize"] for prop in props]
+        if payload.get("mountpoints") is not None:
+            designs["mountpoints"][i] = payload["mountpoints"]
+        if payload.get("mass") is not None:
+            designs["mass"][i] = payload["mass"]
+            designs["cg"][i] = payload["cg"]
+            designs["inertia"][i] = [[payload["Ix"], payload["Ixy"], payload["Ixz"]],
+                                     [payload["Ixy"], payload["Iy"], payload["Iyz"]],
+                                     [payload["Ixz"], payload["Iyz"], payload["Iz"]]]
+    designs.flush()
+    return designs
+
+
+def load(path):
+    """Opens a design or result file read-only without copying it into memory."""
+    return np.load(path, mmap_mode="r")
+
+
+def validate(designs, library=None):
+    """Checks all designs at once, propeller sizes against the range of library (default library if None).
+
+    Returns:
+        ndarray: Error code of each design, the bitwise or of the failed checks in ERRORS (0 if valid).
+    """
+    errors = np.zeros(len(designs), dtype=np.uint8)
+
+    loc_ok = np.isfinite(designs["loc"]).all(axis=(1, 2)) & np.isfinite(designs["mountpoints"]).all(axis=(1, 2))
+    errors[~loc_ok] |= 1
+
+    direction = designs["dir"]
+    dir_ok = np.isfinite(direction).all(axis=(1, 2)) & (np.einsum("npi,npi->np", direction, direction) > 0).all(axis=1)
+    errors[~dir_ok] |= 2
+
+    errors[~np.isin(designs["rot"], (-1, 1)).all(axis=1)] |= 4
+
+    sizes = get_library(library).table["size"]
+    size_ok = ((designs["propsize"] >= sizes.min()) & (designs["propsize"] <= sizes.max())).all(axis=1)
+    errors[~size_ok] |= 8
+
+    # Designs with user defined inertia
+    mass = designs["mass"]
+    given = ~np.isnan(mass)
+    inertia = designs["inertia"][given]
+    symmetric = np.isclose(inertia, np.swapaxes(inertia, 1, 2)).all(axis=(1, 2)) & np.isfinite(inertia).all(axis=(1, 2))
+    eigvals = np.linalg.eigvalsh(np.where(symmetric[:, np.newaxis, np.newaxis], inertia, np.eye(3)))
+    inertia_ok = (mass[given] > 0) & np.isfinite(designs["cg"][given]).all(axis=1) & symmetric & (eigvals > 0).all(axis=1)
+    errors[np.flatnonzero(given)[~inertia_ok]] |= 16
+    return errors
+
+
+def evaluate_chunk(path, output, start, stop, seed=None, hover_kwargs=None, library=None, pitch=None, kv=None):
+    """Evaluates designs start:stop of a design file and writes their results to the result file.
+
+    Returns:
+        int: Number of evaluated designs.
+    """
+    designs = load(path)[start:stop]
+    results = np.load(output, mmap_mode="r+")
+
+    chunk = np.zeros(stop - start, dtype=results.dtype)
+    chunk["alpha"] = np.nan
+    chunk["input_cost"] = np.nan
+    chunk["u"] = np.nan
+    library = get_library(library)
+    chunk["error"] = validate(designs, library)
+
+    valid = np.flatnonzero(chunk["error"] == 0)
+    if valid.size:
+        designs = designs[valid]
+        constants, wmax, prop_masses = library.lookup(designs["propsize"], pitch, kv)
+
+        mass = np.array(designs["mass"])
+        cg = np.array(designs["cg"])
+        inertia = np.array(designs["inertia"])
+        auto = np.isnan(mass)
+        if auto.any():
+            mass[auto], cg[auto], inertia[auto] = body_inertia(designs["loc"][auto], designs["mountpoints"][auto], prop_masses[auto])
+
+        batch = BatchHover(designs["loc"], designs["dir"], designs["rot"], constants, wmax, mass, cg, inertia)
+        # Seed of the chunk, derived from the seed and the first design of the chunk
+        chunk_seed = None if seed is None else int(np.random.SeedSequence([seed, start]).generate_state(1)[0])
+        hover = batch.compute_hover(seed=chunk_seed, **(hover_kwargs or {}))
+        for key in ("status", "alpha", "input_cost", "u"):
+            chunk[key][valid] = hover[key]
+
+    results[start:stop] = chunk
+    results.flush()
+    return stop - start
+
+
+def evaluate(path, output, chunk_size=4096, workers=1, seed=None, hover_kwargs=None, verbose=False, library=None,
+             pitch=None, kv=None):
+    """Evaluates all designs of a design file in chunks and writes the results to a memory-mapped result file,
+       with one record (see result_dtype) per design in the same order.
+
+    Args:
+        path (str): Design file (.npy with dtype design_dtype).
+        output (str): Result file (.npy), overwritten.
+        chunk_size (int, optional): Number of designs per chunk. Defaults to 4096.
+        workers (int, optional): Number of processes evaluating chunks. Defaults to 1.
+        seed (int, optional): Seed of the hover initial guesses. Defaults to None.
+        hover_kwargs (dict, optional): Keyword arguments passed to BatchHover.compute_hover, except the seed,
+                                       which is derived from seed per chunk. Defaults to None.
+        verbose (bool, optional): Print progress. Defaults to False.
+        library (PropLibrary or str, optional): Propeller library, or its path, which worker processes load
+                                                once instead of receiving a copy. Defaults to the default library.
+        pitch (float, optional): Only use propellers of the library with this pitch. Defaults to None.
+        kv (float, optional): Only use motors of the library with this KV. Defaults to None.
+
+    Raises:
+        ValueError: hover_kwargs contains a seed.
+
+    Returns:
+        memmap: Read-only result array.
+    """
+    if hover_kwargs and "seed" in hover_kwargs:
+        raise ValueError("Pass the seed of the evaluation as seed, not in hover_kwargs")
+    designs = load(path)
+    num_designs = len(designs)
+    num_props = designs.dtype["loc"].shape[0]
+    open_memmap(output, mode="w+", dtype=result_dtype(num_props), shape=(num_designs,)).flush()
+
+    chunks = [(start, min(start + chunk_size, num_designs)) for start in range(0, num_designs, chunk_size)]
+    done = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded number of chunks in flight
+            pending = iter(chunks)
+            running = set()
+            while True:
+                for start, stop in pending:
+                    running.add(pool.submit(evaluate_chunk, path, output, start, stop, seed, hover_kwargs, library, pitch, kv))
+                    if len(running) >= 2*workers:
+                        break
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += future.result()
+                    if verbose:
+                        print(f"{done}/{num_designs} designs done")
+    else:
+        for start, stop in chunks:
+            done += evaluate_chunk(path, output, start, stop, seed, hover_kwargs, library, pitch, kv)
+            if verbose:
+                print(f"{done}/{num_designs} designs done")
+
+    return load(output)
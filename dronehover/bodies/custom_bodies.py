@@ -1,9 +1,63 @@
 import numpy as np
 from numpy.linalg import norm as norm
-from dronehover import prop_lib
+from dronehover.proplib import get_library
+
+CONTROLLER_MASS = 0.300     # based on 4S, 2200 mAh lipo
+CONTROLLER_SIZE = (0.105, 0.036, 0.035)     # length, width and height of flight controller and battery
+BEAM_DENSITY = 1500*0.005*0.01      # kg/m, carbon fiber plates, 5mm thickness, 10mm width
+
+
+def point_inertia(r, m):
+    """Inertia tensor of point masses about the origin, summed over the second to last axis.
+
+    Args:
+        r (ndarray): Positions, shape (..., P, 3).
+        m (ndarray): Masses, shape (..., P).
+
+    Returns:
+        ndarray: Inertia tensor, shape (..., 3, 3).
+    """
+    r_sq = np.einsum("...pi,...pi,...p->...", r, r, m)
+    return r_sq[..., np.newaxis, np.newaxis] * np.eye(3) - np.einsum("...pi,...pj,...p->...ij", r, r, m)
+
+
+def body_inertia(positions, mountpoints, prop_masses, controller_mass=CONTROLLER_MASS, beam_density=BEAM_DENSITY):
+    """Computes mass, C.G. and inertia tensor of drone bodies made of a central flight controller,
+       carbon fiber arms from the mounting points to the propellers, and motors with propellers.
+       
+       All leading dimensions are treated as batch dimensions, so that many bodies can be processed at once.
+
+    Args:
+        positions (ndarray): Propeller locations, shape (..., P, 3).
+        mountpoints (ndarray): Arm mounting points, shape (..., P, 3).
+        prop_masses (ndarray): Motor and propeller masses, shape (..., P).
+        controller_mass (float, optional): Mass of flight controller and battery. Defaults to CONTROLLER_MASS.
+        beam_density (float, optional): Mass per unit length of the arms. Defaults to BEAM_DENSITY.
+
+    Returns:
+        tuple: Mass (...), C.G. (..., 3) and inertia tensor about the C.G. (..., 3, 3).
+    """
+    arms = positions - mountpoints
+    beam_masses = beam_density * norm(arms, axis=-1)
+    midpoints = (positions + mountpoints)/2
+    
+    mass = controller_mass + np.sum(beam_masses + prop_masses, axis=-1)
+    
+    cg = (np.einsum("...p,...pi->...i", prop_masses, positions) 
+          + np.einsum("...p,...pi->...i", beam_masses, midpoints)) / mass[..., np.newaxis]
+    
+    length, width, height = CONTROLLER_SIZE
+    I_controller = 1/12 * controller_mass * np.diag([width**2 + height**2, length**2 + height**2, length**2 + width**2])
+    
+    I = (I_controller + point_inertia(-cg[..., np.newaxis, :], np.full(cg.shape[:-1] + (1,), controller_mass))      # Flight controller
+         + point_inertia(positions - cg[..., np.newaxis, :], prop_masses)        # Motors
+         + 1/12 * point_inertia(arms, beam_masses)        # Beams about their midpoints
+         + point_inertia(midpoints - cg[..., np.newaxis, :], beam_masses))     # Parallel axis theorem for beams
+    return mass, cg, I
+
 
 class Custombody:
-    def __init__(self, props, mountpoints=None, mass=None, cg=None, Ix=None, Iy=None, Iz=None, Ixy=None, Ixz=None, Iyz=None):
+    def __init__(self, props, mountpoints=None, mass=None, cg=None, Ix=None, Iy=None, Iz=None, Ixy=None, Ixz=None, Iyz=None, library=None):
         """Class for custom drone bodies
 
         Args:
@@ -14,10 +68,12 @@ class Custombody:
             Ixy (float): Products of inertia (x-y)
             Ixz (float): Products of inertia (x-z)
             Iyz (float): Products of inertia (y-z)
-            props (dict): Propeller properties
+            props (dict): Propeller properties. Optional "pitch" and "kv" select among propellers of the same size.
+            library (PropLibrary or str, optional): Propeller library or its path. Defaults to the default library.
         """        
         
         self.props = props
+        self.library = get_library(library)
         self.mountpoints = mountpoints
 
         if self.mountpoints is None:
@@ -29,6 +85,7 @@ class Custombody:
 
         self.get_props()
 
+        self.auto_inertia = mass is None
         if mass == None:
             self.get_inertia()
         else:
@@ -42,68 +99,26 @@ class Custombody:
             self.Iyz = Iyz
 
     def get_inertia(self):
-        controller_mass = 0.300 # based on 4S, 2200 mAh lipo
-        beam_density = 1500*0.005*0.01 # kg/m, carbon fiber plates, 5mm thickness, 10mm width
-
-        self.mass = controller_mass
-
-        for prop, mountpoint in zip(self.props, self.mountpoints):
-            size = prop["propsize"]
-            prop_mass = prop_lib[f"prop{size}"]["mass"]
-            self.mass += beam_density*norm(np.array(prop["loc"]) - mountpoint) # Add mass of carbon beam
-            self.mass += prop_mass
-
-        self.cg = np.zeros(3)
-        for prop, mountpoint in zip(self.props, self.mountpoints):
-            prop_mass = prop_lib[f"prop{size}"]["mass"]
-            beam_mass = beam_density*norm(np.array(prop["loc"]) - mountpoint)
-            self.cg += prop_mass/self.mass * np.array(prop["loc"])
-            self.cg += beam_mass/self.mass * (np.array(prop["loc"]) + mountpoint) * 0.5
-
-        self.Ix = norm(np.cross(np.array([1,0,0]),self.cg))**2 * controller_mass + 1/12 * controller_mass * (0.036**2 + 0.035**2)
-        self.Iy = norm(np.cross(np.array([0,1,0]),self.cg))**2 * controller_mass + 1/12 * controller_mass * (0.105**2 + 0.035**2)
-        self.Iz = norm(np.cross(np.array([0,0,1]),self.cg))**2 * controller_mass + 1/12 * controller_mass * (0.105**2 + 0.036**2)
-        self.Ixy = 0
-        self.Ixz = 0
-        self.Iyz = 0
-
-        for prop, mountpoint in zip(self.props, self.mountpoints):
-            size = prop["propsize"]
-            prop_mass = prop_lib[f"prop{size}"]["mass"]
-            pos = np.asarray(prop["loc"])
-            arm_length = norm(pos - mountpoint)
-            arm_midpoint = (pos + mountpoint)/2
-            r = pos - self.cg
-
-            self.Ix += norm(np.cross(np.array([1,0,0]),r))**2  * prop_mass      # I due to motors
-            self.Ix += 1/12 * norm(np.cross(np.array([1,0,0]), pos))**2 * beam_density*arm_length    # I due to beam
-            self.Ix += beam_density*arm_length  * norm(np.cross(np.array([1,0,0]), (arm_midpoint - self.cg)))**2     # I due to parallel axis theorem
-
-            self.Iy += norm(np.cross(np.array([0,1,0]),r))**2 * prop_mass
-            self.Iy += 1/12 * norm(np.cross(np.array([0,1,0]), pos))**2 * beam_density*arm_length 
-            self.Iy += beam_density*arm_length  * norm(np.cross(np.array([0,1,0]), (arm_midpoint - self.cg)))**2
-
-            self.Iz += norm(np.cross(np.array([0,0,1]),r))**2 * prop_mass
-            self.Iz += 1/12 * norm(np.cross(np.array([0,0,1]), pos))**2 * beam_density*arm_length 
-            self.Iz += beam_density*arm_length  * norm(np.cross(np.array([0,0,1]), (arm_midpoint - self.cg)))**2
-
-            self.Ixy -= r[0]*r[1]*prop_mass
-            self.Ixy -= 1/12 * pos[0]*pos[1]*beam_density*arm_length 
-            self.Ixy -= beam_density*arm_length  * (arm_midpoint[0]/2 - self.cg[0])*(arm_midpoint[1]/2 - self.cg[1])
-            
-            self.Ixz -= r[0]*r[2]*prop_mass
-            self.Ixz -= 1/12 * pos[0]*pos[2]*beam_density*arm_length 
-            self.Ixz -= beam_density*arm_length  * (arm_midpoint[0]/2 - self.cg[0])*(arm_midpoint[2]/2 - self.cg[2])
-            
-            self.Iyz -= r[1]*r[2]*prop_mass
-            self.Iyz -= 1/12 * pos[1]*pos[2]*beam_density*arm_length 
-            self.Iyz -= beam_density*arm_length  * (arm_midpoint[1]/2 - self.cg[1])*(arm_midpoint[2]/2 - self.cg[2])
-
-        self.cg = self.cg.tolist()
+        mass, cg, I = body_inertia(self.positions, self.mount_positions, self.prop_masses)
+
+        self.mass = float(mass)
+        self.cg = cg.tolist()
+        self.Ix = I[0,0]
+        self.Iy = I[1,1]
+        self.Iz = I[2,2]
+        self.Ixy = I[0,1]
+        self.Ixz = I[0,2]
+        self.Iyz = I[1,2]
 
     def get_props(self):
+        # Propeller properties as arrays, used for the inertia computation
+        self.positions = np.array([prop["loc"] for prop in self.props], dtype=float).reshape(-1, 3)
+        self.mount_positions = np.array(self.mountpoints, dtype=float).reshape(-1, 3)
+        self.prop_sizes = np.array([prop["propsize"] for prop in self.props])
+        pitch = np.array([np.nan if prop.get("pitch") is None else prop["pitch"] for prop in self.props], dtype=float)
+        kv = np.array([np.nan if prop.get("kv") is None else prop["kv"] for prop in self.props], dtype=float)
+        constants, wmax, self.prop_masses = self.library.lookup(self.prop_sizes, pitch, kv)
+        
         for i, prop in enumerate(self.props):
-            size = prop["propsize"]
-            self.props[i]["constants"] = prop_lib[f"prop{size}"]["constants"]
-            self.props[i]["wmax"] = prop_lib[f"prop{size}"]["wmax"]
-        
\ No newline at end of file
+            prop["constants"] = constants[i].tolist()
+            prop["wmax"] = float(wmax[i])
@@ -0,0 +1,90 @@
+import numpy as np
+from numpy import sin, cos, pi
+
+from dronehover.bodies.custom_bodies import body_inertia
+from dronehover.optimization import BatchHover
+from dronehover.proplib import get_library
+
+
+def multirotor(num_arms, length, spin="alternating", tilt=0.0, dihedral=0.0, propsize=5, coaxial=False,
+               coaxial_spacing=0.03, phase=0.0):
+    """Generates a family of N multirotor designs with arms evenly spaced around the body, as stacked arrays.
+
+       Parameters broadcast against each other: scalars are shared by all designs, arrays of shape (N,) give one
+       value per design, and arrays of shape (1, num_arms) or (N, num_arms) one value per arm. spin is given per arm,
+       as shape (num_arms,) or (N, num_arms). N is the broadcast size of the design dimension (1 if all are shared).
+
+    Args:
+        num_arms (int): Number of arms.
+        length (float or ndarray): Arm length in meters.
+        spin (str or list, optional): "alternating" (ccw, cw, ...) or rotation of each arm as "ccw"/"cw" or -1/1.
+                                      Defaults to "alternating".
+        tilt (float or ndarray, optional): Radial tilt of the thrust direction away from -z in radians. Defaults to 0.
+        dihedral (float or ndarray, optional): Upward angle of the arms in radians. Defaults to 0.
+        propsize (float or ndarray, optional): Propeller size in inches. Defaults to 5.
+        coaxial (bool, optional): Stack a second, counter-rotating propeller below each arm. Defaults to False.
+        coaxial_spacing (float, optional): Vertical distance between stacked propellers in meters. Defaults to 0.03.
+        phase (float, optional): Azimuth of the first arm in radians. Defaults to 0.
+
+    Returns:
+        dict: "loc" (N, P, 3), "dir" (N, P, 3), "rot" (N, P), "propsize" (N, P) and "mountpoints" (N, P, 3),
+              with P = num_arms, or 2*num_arms for coaxial designs (upper propellers first).
+    """
+    if isinstance(spin, str):
+        if spin != "alternating":
+            raise ValueError(f"Invalid spin pattern \"{spin}\". Use \"alternating\" or a rotation per arm")
+        spin = np.where(np.arange(num_arms) % 2 == 0, -1, 1)
+    else:
+        spin = np.asarray(spin)
+        if spin.dtype.kind in "US":
+            spin = np.where(spin == "ccw", -1, 1)
+
+    def columns(value):
+        value = np.asarray(value, dtype=float)
+        return value.reshape(-1, 1) if value.ndim < 2 else value
+
+    # Arrays of shape (N, num_arms), N = 1 if shared
+    arrays = np.broadcast_arrays(*(columns(value) for value in (length, tilt, dihedral, propsize)),
+                                 np.atleast_2d(spin).astype(float), np.zeros((1, num_arms)))
+    length, tilt, dihedral, propsize, rot = (np.array(a) for a in arrays[:5])
+    psi = phase + 2*pi*np.arange(num_arms)/num_arms
+
+    loc = np.stack([length*cos(dihedral)*cos(psi), length*cos(dihedral)*sin(psi), -length*sin(dihedral)], axis=-1)
+    direction = np.stack([sin(tilt)*cos(psi), sin(tilt)*sin(psi), -cos(tilt)], axis=-1)
+
+    if coaxial:
+        offset = np.array([0, 0, coaxial_spacing/2])
+        loc = np.concatenate([loc - offset, loc + offset], axis=1)
+        direction = np.concatenate([direction, direction], axis=1)
+        rot = np.concatenate([rot, -rot], axis=1)
+        propsize = np.concatenate([propsize, propsize], axis=1)
+
+    return {"loc": loc, "dir": direction, "rot": rot, "propsize": propsize, "mountpoints": np.zeros_like(loc)}
+
+
+def family_props(family, i=0):
+    """Propeller dictionaries (for Custombody) of design i of a family."""
+    return [{"loc": loc.tolist(), "dir": direction.tolist() + ["ccw" if rot < 0 else "cw"], "propsize": int(size) if size == int(size) else float(size)}
+            for loc, direction, rot, size in zip(family["loc"][i], family["dir"][i], family["rot"][i], family["propsize"][i])]
+
+
+def family_arrays(family, library=None, pitch=None, kv=None):
+    """Propeller and inertial arrays of a family, with inertia computed as for Custombody.
+
+    Args:
+        family (dict): Family of designs (see multirotor).
+        library (PropLibrary or str, optional): Propeller library or its path. Defaults to the default library.
+        pitch (float or ndarray, optional): Propeller pitch, broadcast to the propellers (see PropLibrary.lookup). Defaults to None.
+        kv (float or ndarray, optional): Motor KV, broadcast as pitch. Defaults to None.
+
+    Returns:
+        tuple: Arguments of BatchHover (loc, direction, rot, constants, wmax, mass, cg, inertia).
+    """
+    constants, wmax, prop_masses = get_library(library).lookup(family["propsize"], pitch, kv)
+    mass, cg, inertia = body_inertia(family["loc"], family["mountpoints"], prop_masses)
+    return family["loc"], family["dir"], family["rot"], constants, wmax, mass, cg, inertia
+
+
+def batch_hover(family, library=None, pitch=None, kv=None):
+    """BatchHover of all designs of a family, without constructing a body per design (see family_arrays)."""
+    return BatchHover(*family_arrays(family, library, pitch, kv))
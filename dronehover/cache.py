@@ -0,0 +1,171 @@
+import os
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+# Hover attributes restored from the cache
+CACHED_ATTRIBUTES = ["hover_status", "static_success", "spinning_success", "eta", "w_hat", "u", "tau", "alpha", "input_cost", "screen_reason"]
+
+
+def canonical_array(a, bits=40):
+    """Rounds the mantissa of an array to a fixed number of bits, such that arrays which
+       differ only by floating point noise have the same byte representation.
+    """
+    mantissa, exponent = np.frexp(np.asarray(a, dtype=float))
+    mantissa = np.round(mantissa * 2**bits) / 2**bits
+    return np.ascontiguousarray(np.ldexp(mantissa, exponent) + 0.0)    # + 0.0 removes negative zeros
+
+
+class HoverCache:
+    def __init__(self, maxsize=1024, directory=None, max_bytes=100*2**20):
+        """Cache of hover solutions, keyed on a hash of the effectiveness matrices, input bounds and solver settings.
+           Solutions are kept in an in-memory LRU tier and optionally in a directory of .npz files.
+
+        Args:
+            maxsize (int, optional): Maximum number of solutions kept in memory. Defaults to 1024.
+            directory (str, optional): Directory of the on-disk tier. Defaults to None (memory only).
+            max_bytes (int, optional): Maximum size of the on-disk tier in bytes. Least recently used files are evicted first. Defaults to 100 MiB.
+        """
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_time = 0.0   # Solver time avoided by cache hits
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, hover, tol, **settings):
+        """Computes the cache key of a hover problem.
+
+        Args:
+            hover (Hover): Hover optimizer.
+            tol (float): Solver tolerance.
+            **settings: Further solver settings which change the solution (e.g. static_method).
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+        h = hashlib.sha256()
+        for a in (hover.Bf, hover.Bm, hover.w_hat_bounds):
+            h.update(str(np.shape(a)).encode())
+            h.update(canonical_array(a).tobytes())
+        h.update(repr(float(tol)).encode())
+        h.update(repr(sorted(settings.items())).encode())
+        return h.hexdigest()
+
+    def load(self, hover, key):
+        """Restores a cached solution onto a hover optimizer.
+
+        Returns:
+            bool: True if the solution was found in the cache.
+        """
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+        else:
+            entry = self.read(key)
+            if entry is None:
+                self.misses += 1
+                return False
+            self.disk_hits += 1
+            self.remember(key, entry)
+
+        for attr in CACHED_ATTRIBUTES:
+            value = entry.get(attr)
+            setattr(hover, attr, value.copy() if isinstance(value, np.ndarray) else value)
+        self.saved_time += entry["solve_time"]
+        return True
+
+    def store(self, hover, key, solve_time=0.0):
+        """Stores the current solution of a hover optimizer.
+
+        Args:
+            hover (Hover): Hover optimizer after compute_hover.
+            key (str): Cache key.
+            solve_time (float, optional): Time spent solving, used to account the time saved by hits. Defaults to 0.0.
+        """
+        entry = {attr: getattr(hover, attr, None) for attr in CACHED_ATTRIBUTES}
+        if entry["hover_status"] == "N":
+            entry["w_hat"] = None
+        entry["solve_time"] = solve_time
+        self.remember(key, entry)
+        self.write(key, entry)
+
+    def remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self.path(key)) as data:
+                entry = {attr: None for attr in CACHED_ATTRIBUTES}
+                for attr in data.files:
+                    value = data[attr]
+                    entry[attr] = value if value.ndim else value.item()
+            os.utime(self.path(key))    # Mark as recently used
+        except FileNotFoundError:       # Missing, or evicted by another process sharing the directory
+            return None
+        return entry
+
+    def write(self, key, entry):
+        if self.directory is None:
+            return
+        arrays = {attr: np.asarray(value) for attr, value in entry.items() if value is not None}
+        tmp = os.path.join(self.directory, f"{key}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used files until the on-disk tier is within max_bytes."""
+        stats = []
+        for f in os.listdir(self.directory):
+            if f.endswith(".npz") and not f.endswith(".tmp.npz"):
+                try:
+                    stat = os.stat(os.path.join(self.directory, f))
+                except FileNotFoundError:   # Removed by another process sharing the directory
+                    continue
+                stats.append((stat.st_mtime, stat.st_size, os.path.join(self.directory, f)))
+        total = sum(size for _, size, _ in stats)
+        for _, size, f in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Removes all cached solutions from memory and disk."""
+        self.memory.clear()
+        if self.directory is not None:
+            for f in os.listdir(self.directory):
+                if f.endswith(".npz"):
+                    try:
+                        os.remove(os.path.join(self.directory, f))
+                    except FileNotFoundError:
+                        pass
+
+    def stats(self):
+        """Returns the hit/miss counters of the cache."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {"hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits)/lookups if lookups else 0.0,
+                "saved_time": self.saved_time,
+                "memory_entries": len(self.memory)}
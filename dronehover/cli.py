@@ -0,0 +1,175 @@
+"""Command line interface evaluating drone designs from JSON or JSON lines.
+
+Heavy modules (numpy, scipy and the optimizer) are only imported when designs are evaluated,
+so that the command starts quickly.
+"""
+import sys
+import json
+import argparse
+
+INERTIA_KEYS = ("mass", "cg", "Ix", "Iy", "Iz", "Ixy", "Ixz", "Iyz")
+
+
+def design_from_dict(payload):
+    """Creates a Custombody from a design dictionary with "props", and optionally "mountpoints"
+       and the inertia overrides "mass", "cg", "Ix", "Iy", "Iz", "Ixy", "Ixz" and "Iyz".
+
+    Raises:
+        KeyError: "props" is missing.
+    """
+    from dronehover.bodies.custom_bodies import Custombody
+
+    props = [dict(prop) for prop in payload["props"]]
+    inertia = {key: payload[key] for key in INERTIA_KEYS if payload.get(key) is not None}
+    return Custombody(props, mountpoints=payload.get("mountpoints"), **inertia)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return float(value)
+
+
+def evaluate_design(payload, hover_kwargs=None):
+    """Evaluates the hovering capabilities of a design dictionary (see design_from_dict).
+
+    Args:
+        payload (dict): Design dictionary. An optional "id" is copied to the result.
+        hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover. Defaults to None.
+
+    Returns:
+        dict: JSON-serializable result with "hover_status", "alpha", "input_cost", "u", "eta", "reason" and "time",
+              or "error" if the design is invalid or cannot be evaluated. An exception given as payload
+              (e.g. an unreadable line from read_designs) gives an error result.
+    """
+    from dronehover.optimization import Hover
+
+    result = {"id": payload.get("id")} if isinstance(payload, dict) else {"id": None}
+    # Any failure of a single design (Custombody raises bare Exceptions) becomes an error result
+    try:
+        if isinstance(payload, Exception):
+            raise payload
+        sim = Hover(design_from_dict(payload))
+        hover = sim.compute_hover(**(hover_kwargs or {}))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update({"hover_status": hover.hover_status,
+                   "alpha": _jsonable(hover.alpha),
+                   "input_cost": _jsonable(hover.input_cost),
+                   "u": _jsonable(hover.u),
+                   "eta": _jsonable(hover.eta),
+                   "reason": hover.reason,
+                   "time": hover.total_time})
+    return result
+
+
+def _evaluate(args):
+    index, payload, hover_kwargs = args
+    result = evaluate_design(payload, hover_kwargs)
+    result["index"] = index
+    return result
+
+
+def read_designs(paths):
+    """Yields design dictionaries from files or stdin ("-").
+       Files ending in .json contain one design or a list of designs, other inputs one design per line (JSON lines).
+       Invalid JSON, and missing or unreadable files, are yielded as the exception (json.JSONDecodeError, OSError
+       or UnicodeDecodeError), so that they give an error result without stopping the run.
+    """
+    for path in paths:
+        try:
+            if path != "-" and path.endswith(".json"):
+                with open(path) as f:
+                    try:
+                        data = json.load(f)
+                    except json.JSONDecodeError as e:
+                        data = e
+                yield from data if isinstance(data, list) else [data]
+                continue
+
+            f = sys.stdin if path == "-" else open(path)
+            try:
+                for line in f:
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except json.JSONDecodeError as e:
+                            yield e
+            finally:
+                if f is not sys.stdin:
+                    f.close()
+        except (OSError, UnicodeDecodeError) as e:
+            yield e
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="dronehover", description="Compute the hovering capabilities of drone designs. "
+                                     "Designs are JSON objects with \"props\", and optionally \"id\", \"mountpoints\" and "
+                                     "inertia overrides. One JSON result line is written per design as soon as it finishes.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="Design files (.json or .jsonl), \"-\" for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="Output JSON lines file, \"-\" for stdout (default)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes (default 1)")
+    parser.add_argument("--tol", type=float, default=1e-5, help="Tolerance of the hover optimization (default 1e-5)")
+    parser.add_argument("--n-starts", type=int, default=1, help="Initial guesses per hover mode (default 1)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the initial guesses, combined with the design index")
+    parser.add_argument("--static-method", choices=("nullspace", "slsqp"), default="nullspace")
+    parser.add_argument("--alpha-method", choices=("scaled", "lp"), default="scaled")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    hover_kwargs = {"tol": args.tol, "n_starts": args.n_starts, "static_method": args.static_method,
+                    "alpha_method": args.alpha_method}
+
+    def tasks():
+        for index, payload in enumerate(read_designs(args.inputs)):
+            kwargs = dict(hover_kwargs, seed=None if args.seed is None else [args.seed, index])
+            yield index, payload, kwargs
+
+    try:
+        out = sys.stdout if args.output == "-" else open(args.output, "w")
+    except OSError as e:
+        print(f"dronehover: error: cannot write output: {e}", file=sys.stderr)
+        return 2
+    def write(result):
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+    try:
+        if args.workers > 1:
+            from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                # Keep a bounded number of designs in flight so inputs are streamed
+                pending = tasks()
+                running = {}
+                while True:
+                    for task in pending:
+                        running[pool.submit(_evaluate, task)] = task[0]
+                        if len(running) >= 4*args.workers:
+                            break
+                    if not running:
+                        break
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = running.pop(future)
+                        try:
+                            write(future.result())
+                        except Exception as e:     # e.g. a crashed worker process
+                            write({"id": None, "error": f"{type(e).__name__}: {e}", "index": index})
+        else:
+            for task in tasks():
+                write(_evaluate(task))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
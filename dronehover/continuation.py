@@ -0,0 +1,121 @@
+import numpy as np
+
+from dronehover.optimization import Hover
+
+
+class Continuation:
+    def __init__(self, build, start, stop, step=None, min_step=None, max_step=None, tol=None, cost_change=0.05,
+                 hover_kwargs=None):
+        """Tracks the hover solution of a family of drones along a scalar design parameter (e.g. C.G. offset or
+           arm tilt). Every solve is warm-started from the solution at the previous parameter value, the step size
+           adapts to the change of the input cost, and changes of the hover status are located by bisection.
+
+        Args:
+            build (callable): Function of the parameter value returning a drone class or a Hover optimizer.
+            start (float): First parameter value.
+            stop (float): Last parameter value.
+            step (float, optional): Initial step size. Defaults to (stop - start)/20.
+            min_step (float, optional): Smallest step size. Defaults to tol.
+            max_step (float, optional): Largest step size. Defaults to (stop - start)/5.
+            tol (float, optional): Precision to which status transitions are located. Defaults to (stop - start)*1e-3.
+            cost_change (float, optional): Relative change of the input cost per step above which the step is halved,
+                                           and below a quarter of which it grows by half. Defaults to 0.05.
+            hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover. Defaults to None.
+        """
+        span = abs(stop - start)
+        self.build = build
+        self.start = start
+        self.stop = stop
+        self.direction = 1.0 if stop >= start else -1.0
+        self.tol = span*1e-3 if tol is None else tol
+        self.step = span/20 if step is None else abs(step)
+        self.min_step = self.tol if min_step is None else min_step
+        self.max_step = span/5 if max_step is None else max_step
+        self.cost_change = cost_change
+        self.hover_kwargs = dict(hover_kwargs or {})
+        self.solves = 0
+
+    def solve(self, value, eta0=None):
+        """Solves the hover problem at a parameter value, warm-started from eta0 if given.
+
+        Returns:
+            dict: Parameter value, hover status, input cost, alpha and eta.
+        """
+        hover = self.build(value)
+        if not isinstance(hover, Hover):
+            hover = Hover(hover)
+        kwargs = dict(self.hover_kwargs)
+        if eta0 is not None and len(eta0) == hover.num_props:
+            kwargs["init"] = eta0
+        result = hover.compute_hover(**kwargs)
+        self.solves += 1
+        return {"value": value,
+                "status": result.hover_status,
+                "input_cost": np.nan if result.input_cost is None else result.input_cost,
+                "alpha": np.nan if result.alpha is None else result.alpha,
+                "eta": result.eta}
+
+    def bisect(self, left, right, points):
+        """Locates the status transition between two solutions to the precision tol.
+
+        Returns:
+            dict: Transition with the parameter "value" (midpoint of the final bracket), the "bracket",
+                  and the statuses "from" and "to".
+        """
+        while abs(right["value"] - left["value"]) > self.tol:
+            mid = self.solve((left["value"] + right["value"])/2, left["eta"] if left["eta"] is not None else right["eta"])
+            points.append(mid)
+            if mid["status"] == left["status"]:
+                left = mid
+            else:
+                right = mid
+        return {"value": (left["value"] + right["value"])/2,
+                "bracket": (left["value"], right["value"]),
+                "from": left["status"],
+                "to": right["status"]}
+
+    def run(self, verbose=False):
+        """Walks the parameter from start to stop.
+
+           Transitions are only detected between consecutive solutions, so statuses which exist over an interval
+           shorter than the step size may be missed; max_step bounds this interval.
+
+        Returns:
+            dict: Solutions along the parameter ("values", "status", "input_cost", "alpha", sorted by value),
+                  the list of "transitions" and the number of "solves".
+        """
+        self.solves = 0
+        current = self.solve(self.start)
+        points = [current]
+        transitions = []
+        step = self.step
+
+        while (self.stop - current["value"])*self.direction > 1e-12*max(abs(self.stop), 1):
+            value = current["value"] + self.direction*step
+            if (self.stop - value)*self.direction < 0:
+                value = self.stop
+            new = self.solve(value, current["eta"])
+            points.append(new)
+
+            if new["status"] != current["status"]:
+                transition = self.bisect(current, new, points)
+                transitions.append(transition)
+                if verbose:
+                    print(f"{transition['from']} -> {transition['to']} at {transition['value']:.6g}")
+            elif np.isfinite(current["input_cost"]) and np.isfinite(new["input_cost"]):
+                change = abs(new["input_cost"] - current["input_cost"]) / current["input_cost"]
+                if change > self.cost_change:
+                    step = max(step/2, self.min_step)
+                elif change < self.cost_change/4:
+                    step = min(step*1.5, self.max_step)
+            else:
+                step = min(step*1.5, self.max_step)
+            current = new
+
+        points.sort(key=lambda point: point["value"])
+        return {"values": np.array([point["value"] for point in points]),
+                "status": np.array([point["status"] for point in points], dtype="<U2"),
+                "input_cost": np.array([point["input_cost"] for point in points]),
+                "alpha": np.array([point["alpha"] for point in points]),
+                "transitions": transitions,
+                "solves": self.solves}
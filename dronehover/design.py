@@ -0,0 +1,179 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from numpy import sin, cos, pi
+
+from dronehover.bodies.custom_bodies import Custombody
+from dronehover.optimization import Hover
+
+# Genes of each propeller, with their bounds given by EvolutionaryDesigner
+GENES = ["azimuth", "length", "height", "tilt", "tilt_azimuth", "spin"]
+
+
+def genome_to_props(genome, propsize=5):
+    """Converts a genome of shape (P, 6) into propeller dictionaries for Custombody.
+       Spin genes above 0.5 are "cw", the others "ccw".
+    """
+    props = []
+    for azimuth, length, height, tilt, tilt_azimuth, spin in genome:
+        props.append({"loc": [length*cos(azimuth), length*sin(azimuth), height],
+                      "dir": [sin(tilt)*cos(tilt_azimuth), sin(tilt)*sin(tilt_azimuth), -cos(tilt), "cw" if spin > 0.5 else "ccw"],
+                      "propsize": propsize})
+    return props
+
+
+def evaluate_genome(genome, propsize, required_status, cost_weight, hover_kwargs):
+    """Fitness of a genome: alpha - cost_weight * input_cost if the hover status is one of required_status, else -inf.
+
+    Returns:
+        tuple: Fitness, hover status, alpha and input cost.
+    """
+    sim = Hover(Custombody(genome_to_props(genome, propsize)))
+    sim.compute_hover(**hover_kwargs)
+    if sim.hover_status not in required_status:
+        return -np.inf, sim.hover_status, np.nan, np.nan
+    return sim.alpha - cost_weight*sim.input_cost, sim.hover_status, sim.alpha, sim.input_cost
+
+
+def _evaluate(args):
+    return evaluate_genome(*args)
+
+
+class EvolutionaryDesigner:
+    def __init__(self, num_props, propsize=5, length=(0.08, 0.3), height=(-0.05, 0.05), max_tilt=pi/4,
+                 required_status=("ST",), cost_weight=10.0, population=64, elite=4, tournament=3,
+                 mutation_rate=0.2, mutation_scale=0.1, seed=0, workers=1, hover_kwargs=None):
+        """Genetic algorithm searching propeller layouts (positions, thrust directions and rotation) of Custombody drones.
+           Maximizes alpha and minimizes input cost through the fitness alpha - cost_weight * input_cost,
+           for drones that achieve one of the required hover statuses.
+
+        Args:
+            num_props (int): Number of propellers.
+            propsize (int, optional): Propeller size. Defaults to 5.
+            length (tuple, optional): Bounds of the arm lengths. Defaults to (0.08, 0.3).
+            height (tuple, optional): Bounds of the propeller z coordinates. Defaults to (-0.05, 0.05).
+            max_tilt (float, optional): Maximum tilt of the thrust direction from -z in radians. Defaults to pi/4.
+            required_status (tuple, optional): Accepted hover statuses. Defaults to ("ST",).
+            cost_weight (float, optional): Weight of the input cost in the fitness. Defaults to 10.0.
+            population (int, optional): Population size. Defaults to 64.
+            elite (int, optional): Number of best genomes copied unchanged to the next generation. Defaults to 4.
+            tournament (int, optional): Tournament size of the parent selection. Defaults to 3.
+            mutation_rate (float, optional): Probability of mutating each gene. Defaults to 0.2.
+            mutation_scale (float, optional): Standard deviation of mutations relative to the gene range. Defaults to 0.1.
+            seed (int, optional): Seed of the search. Defaults to 0.
+            workers (int, optional): Number of processes evaluating fitness. Defaults to 1.
+            hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover. Defaults to {"seed": 0}.
+        """
+        self.num_props = num_props
+        self.propsize = propsize
+        self.required_status = tuple(required_status)
+        self.cost_weight = cost_weight
+        self.population = population
+        self.elite = elite
+        self.tournament = tournament
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.workers = workers
+        self.hover_kwargs = {"seed": 0} if hover_kwargs is None else hover_kwargs
+        self.rng = np.random.default_rng(seed)
+
+        # Bounds of each gene, shape (6, 2)
+        self.bounds = np.array([(0, 2*pi), length, height, (0, max_tilt), (0, 2*pi), (0, 1)], dtype=float)
+
+        self.memo = {}
+        self.evaluations = 0
+
+    def random_genomes(self, n):
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return self.rng.uniform(low, high, size=(n, self.num_props, len(GENES)))
+
+    def key(self, genome):
+        """Memoization key, identical for genomes that produce the same drone."""
+        g = np.round(genome, 9)
+        g[:, 5] = genome[:, 5] > 0.5
+        return g.tobytes()
+
+    def fitness(self, genomes, pool=None):
+        """Evaluates genomes, reusing memoized fitness of genomes seen before.
+
+        Returns:
+            ndarray: Fitness of each genome.
+        """
+        keys = [self.key(genome) for genome in genomes]
+        new = {}
+        for key, genome in zip(keys, genomes):
+            if key not in self.memo and key not in new:
+                new[key] = genome
+
+        args = [(genome, self.propsize, self.required_status, self.cost_weight, self.hover_kwargs) for genome in new.values()]
+        if pool is not None:
+            results = pool.map(_evaluate, args, chunksize=max(1, len(args)//(4*self.workers)))
+        else:
+            results = map(_evaluate, args)
+        for key, result in zip(new.keys(), results):
+            self.memo[key] = result
+        self.evaluations += len(new)
+
+        return np.array([self.memo[key][0] for key in keys])
+
+    def select(self, fitness):
+        """Tournament selection of a parent index."""
+        candidates = self.rng.integers(len(fitness), size=self.tournament)
+        return candidates[np.argmax(fitness[candidates])]
+
+    def offspring(self, a, b):
+        """Uniform crossover of whole propellers followed by gaussian mutation."""
+        mask = self.rng.random(self.num_props) < 0.5
+        child = np.where(mask[:, np.newaxis], a, b)
+
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        mutate = self.rng.random(child.shape) < self.mutation_rate
+        child = child + mutate * self.rng.normal(scale=self.mutation_scale, size=child.shape) * (high - low)
+
+        # Angles wrap around, other genes are clipped to their bounds
+        for gene in (0, 4):
+            child[:, gene] = np.mod(child[:, gene], 2*pi)
+        return np.clip(child, low, high)
+
+    def run(self, generations, verbose=False):
+        """Runs the genetic algorithm.
+
+        Args:
+            generations (int): Number of generations.
+            verbose (bool, optional): Print progress every generation. Defaults to False.
+
+        Returns:
+            dict: Best genome, its drone, fitness, hover status, alpha, input cost, and the best/mean fitness per generation.
+        """
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            genomes = self.random_genomes(self.population)
+            fitness = self.fitness(genomes, pool)
+            history = {"best": [], "mean": []}
+
+            for generation in range(generations):
+                order = np.argsort(-fitness)
+                children = [genomes[i] for i in order[:self.elite]]
+                while len(children) < self.population:
+                    children.append(self.offspring(genomes[self.select(fitness)], genomes[self.select(fitness)]))
+                genomes = np.array(children)
+                fitness = self.fitness(genomes, pool)
+
+                feasible = fitness[np.isfinite(fitness)]
+                history["best"].append(fitness.max())
+                history["mean"].append(feasible.mean() if feasible.size else -np.inf)
+                if verbose:
+                    print(f"Generation {generation+1}: best fitness {fitness.max():.4f}, "
+                          f"feasible {feasible.size}/{self.population}, evaluations {self.evaluations}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        best = genomes[np.argmax(fitness)]
+        best_fitness, status, alpha, input_cost = self.memo[self.key(best)]
+        return {"genome": best,
+                "drone": Custombody(genome_to_props(best, self.propsize)),
+                "fitness": best_fitness,
+                "hover_status": status,
+                "alpha": alpha,
+                "input_cost": input_cost,
+                "history": {key: np.array(value) for key, value in history.items()}}
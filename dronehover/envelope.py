@@ -0,0 +1,189 @@
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from dronehover.optimization import Hover, scale_forces
+
+FEASIBLE = 1
+INFEASIBLE = 0
+BOUNDARY = -1
+
+
+def _classify(args):
+    """Hover statuses of a chunk of effectiveness matrices."""
+    Bf, Bm, hover_kwargs = args
+    statuses = []
+    for bf, bm in zip(Bf, Bm):
+        hover = Hover.from_matrices(bf, bm)
+        statuses.append(hover.compute_hover(**hover_kwargs).hover_status)
+    return statuses
+
+
+class CGEnvelope:
+    def __init__(self, drone, bounds, axes=None, max_depth=6, initial_depth=2, feasible=("ST",), workers=1,
+                 chunk_size=32, hover_kwargs=None):
+        """Maps the region of C.G. positions in which a drone can hover, refining a quadtree (2D) or octree (3D)
+           only in cells whose corners disagree about feasibility.
+
+           The thrust and moment of every propeller about the origin do not depend on the C.G., so they are computed
+           once and only the scaling to Bf and Bm (see scale_forces) is repeated for every C.G. position, at fixed
+           mass and inertia. Cells whose corners all agree are assumed to be uniform, so features smaller than
+           the initial cells may be missed.
+
+        Args:
+            drone (class): Drone class containing inertial properties and propeller configurations.
+            bounds (list): (low, high) of every mapped C.G. coordinate, 2 or 3 entries.
+            axes (tuple, optional): Body axes (0, 1, 2 for x, y, z) of the bounds. Defaults to the first len(bounds) axes.
+            max_depth (int, optional): Depth of the finest cells, 2**max_depth cells per axis. Defaults to 6.
+            initial_depth (int, optional): Depth of the initial uniform cells. Defaults to 2.
+            feasible (tuple, optional): Hover statuses counted as feasible. Defaults to ("ST",).
+            workers (int, optional): Number of processes solving C.G. positions. Defaults to 1.
+            chunk_size (int, optional): Number of C.G. positions per parallel task. Defaults to 32.
+            hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover. Defaults to None.
+        """
+        hover = Hover(drone)
+        self.thrust = hover.thrust
+        self.moment = hover.moment
+        self.mass = hover.mass
+        self.inertia = hover.inertia
+        self.cg = hover.cg
+
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.dim = len(self.bounds)
+        if self.dim not in (2, 3):
+            raise ValueError("C.G. envelopes can only be mapped in 2 or 3 dimensions")
+        self.axes = tuple(range(self.dim)) if axes is None else tuple(axes)
+        self.max_depth = max_depth
+        self.initial_depth = min(initial_depth, max_depth)
+        self.resolution = 2**max_depth
+        self.feasible = tuple(feasible)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.hover_kwargs = hover_kwargs or {}
+
+        self.status = {}    # Hover status of every evaluated corner, by integer grid coordinates
+        self.offsets = np.array(list(product((0, 1), repeat=self.dim)))     # Corners of the unit cell
+
+    def position(self, corners):
+        """Mapped coordinates of integer grid corners, shape (n, dim)."""
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return low + np.asarray(corners) / self.resolution * (high - low)
+
+    def evaluate(self, corners, pool=None):
+        """Solves the hover problem at all corners which were not evaluated before."""
+        corners = [corner for corner in dict.fromkeys(map(tuple, corners)) if corner not in self.status]
+        if not corners:
+            return
+
+        cg = np.tile(self.cg, (len(corners), 1))
+        cg[:, self.axes] = self.position(corners)
+        Bf, Bm = scale_forces(self.thrust, self.moment, np.full(len(corners), self.mass), cg,
+                              np.broadcast_to(self.inertia, (len(corners), 3, 3)))
+
+        chunks = [(Bf[i:i + self.chunk_size], Bm[i:i + self.chunk_size], self.hover_kwargs)
+                  for i in range(0, len(corners), self.chunk_size)]
+        results = pool.map(_classify, chunks) if pool is not None else map(_classify, chunks)
+        statuses = [status for chunk in results for status in chunk]
+        self.status.update(zip(corners, statuses))
+
+    def run(self, verbose=False):
+        """Refines the cells level by level, evaluating the corners of each level together.
+
+        Returns:
+            dict: Leaf cells ("lower" and "size" in mapped coordinates, "cell_status" FEASIBLE, INFEASIBLE or BOUNDARY),
+                  evaluated corners ("points" and "point_status" hover statuses), the boundary mesh ("vertices" at edge
+                  crossings, "segments" in 2D or "triangles" in 3D), and the number of "solves" against the
+                  "grid_solves" of a uniform grid of the finest resolution.
+        """
+        size = 2**(self.max_depth - self.initial_depth)
+        lower = np.array(list(product(range(0, self.resolution, size), repeat=self.dim)))
+        sizes = np.full(len(lower), size)
+        leaves = {"lower": [], "size": [], "status": []}
+
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            depth = self.initial_depth
+            while len(lower):
+                corners = lower[:, np.newaxis, :] + sizes[:, np.newaxis, np.newaxis] * self.offsets
+                self.evaluate(corners.reshape(-1, self.dim), pool)
+
+                feasible = np.array([[self.status[tuple(c)] in self.feasible for c in cell] for cell in corners])
+                mixed = feasible.any(axis=1) & ~feasible.all(axis=1)
+                refine = mixed & (sizes > 1)
+                if verbose:
+                    print(f"Depth {depth}: {len(lower)} cells, {refine.sum()} refined, {len(self.status)} solves")
+
+                leaf = ~refine
+                leaves["lower"].append(lower[leaf])
+                leaves["size"].append(sizes[leaf])
+                leaves["status"].append(np.where(mixed[leaf], BOUNDARY, np.where(feasible[leaf, 0], FEASIBLE, INFEASIBLE)))
+
+                half = sizes[refine] // 2
+                lower = (lower[refine][:, np.newaxis, :] + half[:, np.newaxis, np.newaxis] * self.offsets).reshape(-1, self.dim)
+                sizes = np.repeat(half, len(self.offsets))
+                depth += 1
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        lower = np.concatenate(leaves["lower"])
+        sizes = np.concatenate(leaves["size"])
+        cell_status = np.concatenate(leaves["status"]).astype(np.int8)
+        vertices, elements = self.boundary_mesh(lower[cell_status == BOUNDARY])
+
+        points = np.array(list(self.status.keys()))
+        scale = (self.bounds[:, 1] - self.bounds[:, 0]) / self.resolution
+        result = {"lower": self.position(lower),
+                  "size": sizes[:, np.newaxis] * scale,
+                  "cell_status": cell_status,
+                  "points": self.position(points),
+                  "point_status": np.array(list(self.status.values()), dtype="<U2"),
+                  "vertices": vertices,
+                  "solves": len(self.status),
+                  "grid_solves": (self.resolution + 1)**self.dim}
+        result["segments" if self.dim == 2 else "triangles"] = elements
+        return result
+
+    def boundary_mesh(self, cells):
+        """Builds the boundary between feasible and infeasible corners of the finest boundary cells.
+           Vertices lie at the midpoints of cell edges with differing feasibility and are shared between cells.
+           In 2D the vertices of a cell are joined by segments, in 3D they are ordered around their centroid
+           and joined by a fan of triangles.
+
+        Returns:
+            tuple: Vertices in mapped coordinates (V, dim), and segments (S, 2) or triangles (T, 3) as vertex indices.
+        """
+        edges = [(i, j) for i, j in product(range(len(self.offsets)), repeat=2)
+                 if i < j and np.abs(self.offsets[i] - self.offsets[j]).sum() == 1]
+        index = {}
+        elements = []
+        for cell in cells:
+            corners = cell + self.offsets
+            feasible = [self.status[tuple(c)] in self.feasible for c in corners]
+            crossings = []
+            keys = []
+            for i, j in edges:
+                if feasible[i] != feasible[j]:
+                    key = tuple(corners[i] + corners[j])     # Twice the edge midpoint, unique per edge
+                    crossings.append(index.setdefault(key, len(index)))
+                    keys.append(key)
+            if len(crossings) < self.dim:
+                continue
+
+            # Order the crossings around their centroid
+            points = np.array(keys) / 2 - cell
+            centered = points - points.mean(axis=0)
+            if self.dim == 2:
+                angle = np.arctan2(centered[:, 1], centered[:, 0])
+            else:
+                _, _, Vt = np.linalg.svd(centered)
+                angle = np.arctan2(centered @ Vt[1], centered @ Vt[0])
+            crossings = [crossings[k] for k in np.argsort(angle)]
+
+            if self.dim == 2:
+                elements.extend(zip(crossings[0::2], crossings[1::2]))
+            else:
+                elements.extend((crossings[0], crossings[k], crossings[k + 1]) for k in range(1, len(crossings) - 1))
+
+        vertices = self.position(np.array(list(index.keys()), dtype=float).reshape(-1, self.dim) / 2)
+        return vertices, np.array(elements, dtype=int).reshape(-1, self.dim)
@@ -0,0 +1,166 @@
+import numpy as np
+from numpy.linalg import norm
+
+from dronehover.optimization import G
+
+STRATEGIES = ("random", "min_norm", "symmetric")
+
+
+def _bounds(w_hat_bounds):
+    return w_hat_bounds[0]**2, w_hat_bounds[1]**2
+
+
+def _perturb(eta, w_hat_bounds):
+    """Adds a small deterministic perturbation. SLSQP stalls when all inputs are equal, where the spinning
+       constraint norm(f x tau) is not differentiable for symmetric drones."""
+    lb, ub = _bounds(w_hat_bounds)
+    pattern = np.random.default_rng(0).uniform(-1, 1, size=eta.shape)
+    return np.clip(eta * (1 + 1e-3*pattern), lb, ub)
+
+
+def thrust_direction(Bf):
+    """Unit direction of the specific force at equal inputs, or the dominant direction of Bf if that vanishes."""
+    f = Bf.sum(axis=1)
+    if norm(f) > 1e-9 * max(norm(Bf), 1e-300):
+        return f / norm(f)
+    u, _, _ = np.linalg.svd(Bf)
+    return u[:, 0]
+
+
+def scale_to_hover(Bf, eta, w_hat_bounds):
+    """Scales eta so that it produces a specific force of magnitude G, within the input bounds."""
+    lb, ub = _bounds(w_hat_bounds)
+    f = norm(Bf @ eta)
+    if f > 0:
+        eta = eta * G / f
+    return np.clip(eta, lb, ub)
+
+
+def min_norm(Bf, Bm, w_hat_bounds=(0.02, 1)):
+    """Minimum-norm inputs producing G along the thrust direction with zero torque,
+       [Bf; Bm] @ eta = [G * d; 0], projected onto the input bounds. When this system has no solution
+       (e.g. drones that can only hover while spinning), falls back to the symmetric guess."""
+    B = np.vstack([Bf, Bm])
+    target = np.concatenate([G * thrust_direction(Bf), np.zeros(3)])
+    eta, *_ = np.linalg.lstsq(B, target, rcond=None)
+    if norm(B @ eta - target) > 1e-6 * G:
+        return symmetric(Bf, Bm, w_hat_bounds)
+    lb, ub = _bounds(w_hat_bounds)
+    return _perturb(np.clip(eta, lb, ub), w_hat_bounds)
+
+
+def symmetric(Bf, Bm, w_hat_bounds=(0.02, 1)):
+    """Equal inputs scaled to produce G, the hover solution of symmetric drones such as the standard bodies."""
+    return _perturb(scale_to_hover(Bf, np.ones(Bf.shape[1]), w_hat_bounds), w_hat_bounds)
+
+
+def random(Bf, Bm, w_hat_bounds=(0.02, 1), rng=None):
+    """Uniform random inputs within the bounds."""
+    lb, ub = _bounds(w_hat_bounds)
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.uniform(lb, ub, size=Bf.shape[1])
+
+
+def features(Bf, Bm):
+    """Feature vector of a design for nearest neighbour search, each matrix normalized by its largest column."""
+    fscale = max(norm(Bf, axis=0).max(), 1e-300)
+    mscale = max(norm(Bm, axis=0).max(), 1e-300)
+    return np.concatenate([Bf.ravel() / fscale, Bm.ravel() / mscale])
+
+
+class WarmStartIndex:
+    def __init__(self, max_size=100000):
+        """Nearest neighbour index of solved designs, giving the solution of the most similar solved design
+           (with the same number of propellers) as initial guess.
+
+        Args:
+            max_size (int, optional): Maximum number of stored designs per number of propellers,
+                                      the oldest are dropped first. Defaults to 100000.
+        """
+        self.max_size = max_size
+        # Preallocated buffers per number of propellers, grown by doubling up to max_size and then overwritten
+        # as a ring buffer. Only the first counts[num_props] rows are filled.
+        self.features = {}
+        self.etas = {}
+        self.counts = {}
+        self.added = {}     # Number of designs added, the next row is added % max_size once full
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def add(self, Bf, Bm, eta):
+        """Stores the solution eta of a design."""
+        num_props = Bf.shape[1]
+        feature = features(Bf, Bm)
+        if num_props not in self.features:
+            self.features[num_props] = np.empty((min(16, self.max_size), feature.size))
+            self.etas[num_props] = np.empty((min(16, self.max_size), num_props))
+            self.counts[num_props] = 0
+            self.added[num_props] = 0
+
+        count = self.counts[num_props]
+        capacity = len(self.features[num_props])
+        if count == capacity and capacity < self.max_size:
+            capacity = min(2*capacity, self.max_size)
+            for buffers in (self.features, self.etas):
+                grown = np.empty((capacity, buffers[num_props].shape[1]))
+                grown[:count] = buffers[num_props]
+                buffers[num_props] = grown
+
+        row = self.added[num_props] % self.max_size
+        self.features[num_props][row] = feature
+        self.etas[num_props][row] = eta
+        self.counts[num_props] = min(count + 1, self.max_size)
+        self.added[num_props] += 1
+
+    def add_hover(self, hover):
+        """Stores the solution of a Hover optimizer if it can hover."""
+        if getattr(hover, "hover_status", None) in ("ST", "SP"):
+            self.add(hover.Bf, hover.Bm, hover.eta)
+
+    def query(self, Bf, Bm, w_hat_bounds=(0.02, 1)):
+        """Solution of the nearest stored design, rescaled to produce G with Bf. None if no design with the
+           same number of propellers is stored."""
+        num_props = Bf.shape[1]
+        if num_props not in self.features:
+            return None
+        count = self.counts[num_props]
+        distance = norm(self.features[num_props][:count] - features(Bf, Bm), axis=1)
+        return scale_to_hover(Bf, self.etas[num_props][np.argmin(distance)], w_hat_bounds)
+
+
+def initial_guess(strategy, Bf, Bm, w_hat_bounds=(0.02, 1), rng=None):
+    """Computes an initial guess of eta.
+
+    Args:
+        strategy (str, ndarray or WarmStartIndex): "random", "min_norm", "symmetric", an explicit eta,
+                                                   or an index of solved designs (falls back to "min_norm" when empty).
+        Bf (ndarray): Force effectiveness matrix, shape (3, P).
+        Bm (ndarray): Moment effectiveness matrix, shape (3, P).
+        w_hat_bounds (tuple, optional): Bounds of the normalized angular velocities. Defaults to (0.02, 1).
+        rng (Generator, optional): Random generator of the "random" strategy. Defaults to None.
+
+    Raises:
+        ValueError: Unknown strategy or explicit eta of the wrong shape.
+
+    Returns:
+        ndarray: Initial guess of eta within the bounds, shape (P,).
+    """
+    lb, ub = _bounds(w_hat_bounds)
+    if isinstance(strategy, WarmStartIndex):
+        eta = strategy.query(Bf, Bm, w_hat_bounds)
+        return min_norm(Bf, Bm, w_hat_bounds) if eta is None else eta
+    if isinstance(strategy, str):
+        if strategy == "random":
+            return random(Bf, Bm, w_hat_bounds, rng)
+        if strategy == "min_norm":
+            return min_norm(Bf, Bm, w_hat_bounds)
+        if strategy == "symmetric":
+            return symmetric(Bf, Bm, w_hat_bounds)
+        raise ValueError(f"Invalid initial guess \"{strategy}\". Use only {', '.join(repr(s) for s in STRATEGIES)}, "
+                         "an array or a WarmStartIndex")
+
+    eta = np.asarray(strategy, dtype=float)
+    if eta.shape != (Bf.shape[1],):
+        raise ValueError(f"Initial guess must have shape ({Bf.shape[1]},)")
+    return np.clip(eta, lb, ub)
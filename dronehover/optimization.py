@@ -1,10 +1,152 @@
+import time
+import pickle
 import warnings
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
-from numpy.linalg import inv, norm
-from scipy.optimize import minimize
+from numpy.linalg import norm
+from scipy.linalg import null_space
+from scipy.sparse import block_diag
+from scipy.optimize import minimize, linprog, OptimizeResult
+
+from dronehover.attainable import attainable_set
 
 G = 9.81    # gravitational acceleration
 
+
+def _picklable(obj):
+    """Checks whether an object can be sent to worker processes."""
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
+
+def prop_arrays(props):
+    """Converts a list of propeller dictionaries into stacked arrays.
+
+    Args:
+        props (list): Propeller properties, each containing "loc", "dir", "constants" and "wmax".
+
+    Returns:
+        tuple: Locations (P, 3), thrust directions (P, 3), rotation senses (P,), 
+               propeller constants (P, 2) and maximum angular velocities (P,).
+    """
+    loc = np.array([prop["loc"] for prop in props], dtype=float)
+    direction = np.array([prop["dir"][:3] for prop in props], dtype=float)
+    rot = np.array([-1 if prop["dir"][-1] == "ccw" else 1 for prop in props], dtype=float)  # Direction of propeller rotation
+    constants = np.array([prop["constants"] for prop in props], dtype=float)
+    wmax = np.array([prop["wmax"] for prop in props], dtype=float)
+    return loc, direction, rot, constants, wmax
+
+
+def effectiveness_matrices(loc, direction, rot, constants, wmax, mass, cg, inertia):
+    """Computes the force and moment effectiveness matrices Bf and Bm.
+    
+    All leading dimensions are treated as batch dimensions, so that many drones
+    can be processed at once. P is the number of propellers.
+
+    Args:
+        loc (ndarray): Propeller locations in body-fixed axis, shape (..., P, 3).
+        direction (ndarray): Thrust directions (need not be unit vectors), shape (..., P, 3).
+        rot (ndarray): Propeller rotation, -1 for "ccw" and 1 for "cw", shape (..., P).
+        constants (ndarray): Force and moment constants, shape (..., P, 2).
+        wmax (ndarray): Maximum propeller angular velocity, shape (..., P).
+        mass (ndarray): Drone mass, shape (...).
+        cg (ndarray): C.G. location, shape (..., 3).
+        inertia (ndarray): Inertia tensor, shape (..., 3, 3).
+
+    Returns:
+        tuple: Bf and Bm, each of shape (..., 3, P).
+    """
+    thrust, moment = prop_forces(loc, direction, rot, constants, wmax)
+    return scale_forces(thrust, moment, mass, cg, inertia)
+
+
+def prop_forces(loc, direction, rot, constants, wmax):
+    """Computes the thrust and the moment about the body-fixed origin of each propeller at maximum angular velocity.
+       These do not depend on the inertial properties of the drone. Arguments as in effectiveness_matrices.
+
+    Returns:
+        tuple: Thrust and moment, each of shape (..., P, 3).
+    """
+    direction = direction / norm(direction, axis=-1, keepdims=True)
+    
+    thrust = (constants[..., 0] * wmax**2)[..., np.newaxis] * direction
+    moment = np.cross(loc, thrust) + (constants[..., 1] * wmax**2 * rot)[..., np.newaxis] * direction
+    return thrust, moment
+
+
+def scale_forces(thrust, moment, mass, cg, inertia):
+    """Computes Bf and Bm from propeller thrusts and moments about the origin (see prop_forces).
+
+    Returns:
+        tuple: Bf and Bm, each of shape (..., 3, P).
+    """
+    moment = moment - np.cross(cg[..., np.newaxis, :], thrust)    # Moment about C.G.
+    
+    Bf = np.swapaxes(thrust, -1, -2) / mass[..., np.newaxis, np.newaxis]
+    Bm = np.linalg.solve(inertia, np.swapaxes(moment, -1, -2))
+    return Bf, Bm
+
+
+def max_thrust(Bf, Bm, direction, w_hat_bounds=(0.02, 1), static=True):
+    """Computes the maximum specific force along a thrust direction, within the input bounds and with torque balance.
+    
+       Maximizes direction @ Bf @ eta subject to a specific force parallel to direction and either zero torque (static)
+       or a torque parallel to direction (spinning). Both conditions are linear in eta, so this is a linear program.
+       Leading dimensions are batch dimensions: all designs are solved together as one block diagonal linear program.
+
+    Args:
+        Bf (ndarray): Force effectiveness matrices, shape (..., 3, P).
+        Bm (ndarray): Moment effectiveness matrices, shape (..., 3, P).
+        direction (ndarray): Unit thrust directions, shape (..., 3).
+        w_hat_bounds (tuple, optional): Bounds of the normalized angular velocities. Defaults to (0.02, 1).
+        static (bool or ndarray, optional): Zero torque (True) or torque parallel to the thrust (False), per design. Defaults to True.
+
+    Returns:
+        tuple: Maximum specific force (...) and the inputs eta achieving it (..., P). NaN where the program is infeasible.
+    """
+    Bf = np.asarray(Bf, dtype=float)
+    Bm = np.asarray(Bm, dtype=float)
+    batch_shape = Bf.shape[:-2]
+    num_props = Bf.shape[-1]
+    
+    Bf = Bf.reshape(-1, 3, num_props)
+    Bm = Bm.reshape(-1, 3, num_props)
+    d = np.asarray(direction, dtype=float).reshape(-1, 3)
+    static = np.broadcast_to(np.asarray(static, dtype=bool), batch_shape).reshape(-1)
+    n = Bf.shape[0]
+    
+    # Projection onto the plane normal to the thrust direction
+    proj = np.eye(3) - d[:, :, np.newaxis] * d[:, np.newaxis, :]
+    torque = np.where(static[:, np.newaxis, np.newaxis], Bm, proj @ Bm)
+    A_eq = np.concatenate([proj @ Bf, torque], axis=1)     # (n, 6, P)
+    c = -np.einsum("ni,nip->np", d, Bf)
+    bounds = (w_hat_bounds[0]**2, w_hat_bounds[1]**2)
+    
+    f_max = np.full(n, np.nan)
+    eta_max = np.full((n, num_props), np.nan)
+    
+    if n == 0:
+        return f_max.reshape(batch_shape), eta_max.reshape(batch_shape + (num_props,))
+    
+    lp = linprog(c.reshape(-1), A_eq=block_diag(list(A_eq), format="csr"), b_eq=np.zeros(6*n), bounds=bounds, method="highs")
+    if lp.status == 0:
+        eta_max[:] = lp.x.reshape(n, num_props)
+        f_max[:] = -np.sum(c * eta_max, axis=1)
+    else:
+        # One infeasible design makes the joint program infeasible, solve separately
+        for i in range(n):
+            lp = linprog(c[i], A_eq=A_eq[i], b_eq=np.zeros(6), bounds=bounds, method="highs")
+            if lp.status == 0:
+                eta_max[i] = lp.x
+                f_max[i] = -lp.fun
+                
+    return f_max.reshape(batch_shape), eta_max.reshape(batch_shape + (num_props,))
+
+
 class Hover:
     def __init__(self, drone):
         """Optimal hover optimizer which computes the hovering capabilities of a drone.
@@ -12,54 +154,144 @@ class Hover:
         Args:
             drone (class): Drone class containing inertial properties and propeller configurations.
         """        
+        t0 = time.perf_counter()
         self.drone = drone
         
         self.num_props = len(self.drone.props)
         
         self.drone_checker()
         
-        m = drone.mass * np.eye(3)
-        
-        cg = np.asarray(drone.cg)
-        
-        I = np.array([[drone.Ix, drone.Ixy, drone.Ixz],
-                    [drone.Ixy, drone.Iy, drone.Iyz],
-                    [drone.Ixz, drone.Iyz, drone.Iz]])
+        self.get_inertia()
 
-        self.w_hat_bounds = np.array((0.02, 1))
+        # Thrust and moment about the origin of each propeller, kept for incremental updates
+        self.thrust, self.moment = prop_forces(*prop_arrays(drone.props))
 
         # Compute effectiveness matrices Bf and Bm
-        self.Bf = np.zeros((3, self.num_props))
-        self.Bm = np.zeros((3, self.num_props))
+        Bf, Bm = scale_forces(self.thrust, self.moment, self.mass, self.cg, self.inertia)
 
-        for idx, prop in enumerate(drone.props):
-            k_f = prop["constants"][0]
-            k_m = prop["constants"][1]
-            w_max = prop["wmax"] 
-            prop_loc = np.array(prop["loc"])[np.newaxis,:] # Position of propeller from body-fixed axis
-            prop_r = prop_loc - cg[np.newaxis,:]    # Position of propeller from C.G.
-            prop_dir = np.array(prop["dir"][:3]) # Direction of thrust vector
-            prop_dir = (prop_dir/norm(prop_dir))[np.newaxis,:]
-            
-            prop_rot = -1 if prop["dir"][-1] == "ccw" else 1    # Direction of propeller rotation
-            
-            self.Bf[:,idx] = k_f * w_max**2 * prop_dir[0,:].T
+        self.set_matrices(Bf, Bm)
+        self.build_time = time.perf_counter() - t0
+        
+    def get_inertia(self):
+        """Reads the mass, C.G. and inertia tensor of the drone."""
+        drone = self.drone
+        self.mass = np.asarray(drone.mass, dtype=float)
+        self.cg = np.asarray(drone.cg, dtype=float)
+        self.inertia = np.array([[drone.Ix, drone.Ixy, drone.Ixz],
+                                 [drone.Ixy, drone.Iy, drone.Iyz],
+                                 [drone.Ixz, drone.Iyz, drone.Iz]], dtype=float)
+        
+    def update_prop(self, i, loc=None, dir=None, propsize=None):
+        """Changes a single propeller and updates the effectiveness matrices incrementally.
+           If the inertial properties of the drone do not change, only column i of Bf and Bm is recomputed
+           and the Gram matrices receive rank-one updates. Otherwise the matrices are rescaled from the stored
+           propeller thrusts and moments. The next compute_hover is warm-started from the current solution.
+
+        Args:
+            i (int): Index of the propeller.
+            loc (list, optional): New propeller location. Defaults to None (unchanged).
+            dir (list, optional): New thrust direction and rotation, e.g. [0, 0, -1, "ccw"]. Defaults to None (unchanged).
+            propsize (int, optional): New propeller size. Defaults to None (unchanged).
             
-            self.Bm[:,idx] = (np.cross(prop_r[0,:], k_f*w_max**2*prop_dir[0,:])
-                            + k_m*w_max**2*prop_rot*prop_dir[0,:]).T
+        Raises:
+            ValueError: Hover optimizer was not created from a drone class.
+        """
+        if self.drone is None:
+            raise ValueError("update_prop requires a Hover created from a drone class")
+        
+        prop = self.drone.props[i]
+        if loc is not None:
+            prop["loc"] = list(loc)
+        if dir is not None:
+            prop["dir"] = list(dir)
+        if propsize is not None:
+            prop["propsize"] = propsize
+        self.drone_checker()
+        
+        # Refresh propeller constants and automatically computed inertia of the drone
+        if hasattr(self.drone, "get_props"):
+            self.drone.get_props()
+        if getattr(self.drone, "auto_inertia", False):
+            self.drone.get_inertia()
             
-        self.Bf = inv(m) @ self.Bf
+        mass, cg, inertia = self.mass, self.cg, self.inertia
+        self.get_inertia()
         
-        self.Bm = inv(I) @ self.Bm
+        thrust, moment = prop_forces(*prop_arrays([prop]))
+        self.thrust[i] = thrust[0]
+        self.moment[i] = moment[0]
         
-        self.rank_f = np.linalg.matrix_rank(self.Bf)
-        self.rank_m = np.linalg.matrix_rank(self.Bm)
+        if getattr(self, "eta", None) is not None:
+            self.warm_eta = np.array(self.eta)
+        
+        if not (np.array_equal(mass, self.mass) and np.array_equal(cg, self.cg) and np.array_equal(inertia, self.inertia)):
+            Bf, Bm = scale_forces(self.thrust, self.moment, self.mass, self.cg, self.inertia)
+            self.set_matrices(Bf, Bm)
+            return
         
-        self.gram_f = self.Bf @ self.Bf.T
-        self.gram_m = self.Bm @ self.Bm.T
+        bf_old = self.Bf[:, i].copy()
+        bm_old = self.Bm[:, i].copy()
+        bf, bm = scale_forces(thrust, moment, self.mass, self.cg, self.inertia)
+        self.Bf[:, i] = bf[:, 0]
+        self.Bm[:, i] = bm[:, 0]
         
+        # Rank-one updates of the Gram matrices
+        self.gram_f += np.outer(self.Bf[:, i], self.Bf[:, i]) - np.outer(bf_old, bf_old)
+        self.gram_m += np.outer(self.Bm[:, i], self.Bm[:, i]) - np.outer(bm_old, bm_old)
         self.eig_f, _ = np.linalg.eig(self.gram_f)
         self.eig_m, _ = np.linalg.eig(self.gram_m)
+        
+        self.A_f[:, i] = self.A_f[i, :] = self.Bf.T @ self.Bf[:, i]
+        self.A_m[:, i] = self.A_m[i, :] = self.Bm.T @ self.Bm[:, i]
+        
+        self.rank_f = np.linalg.matrix_rank(self.Bf)
+        self.rank_m = np.linalg.matrix_rank(self.Bm)
+        self.null_m = null_space(self.Bm)
+        
+    @classmethod
+    def from_matrices(cls, Bf, Bm, **derived):
+        """Creates a hover optimizer directly from effectiveness matrices, without a drone class.
+
+        Args:
+            Bf (ndarray): Force effectiveness matrix of shape (3, P), already scaled by the mass.
+            Bm (ndarray): Moment effectiveness matrix of shape (3, P), already scaled by the inertia.
+            **derived: Precomputed derived properties which are not recomputed (see set_matrices).
+
+        Returns:
+            Hover: Hover optimizer for the given matrices.
+        """
+        t0 = time.perf_counter()
+        self = cls.__new__(cls)
+        self.drone = None
+        self.num_props = Bf.shape[1]
+        self.set_matrices(np.array(Bf, dtype=float), np.array(Bm, dtype=float), **derived)
+        self.build_time = time.perf_counter() - t0
+        return self
+        
+    def set_matrices(self, Bf, Bm, rank_f=None, rank_m=None, gram_f=None, gram_m=None, eig_f=None, eig_m=None, null_m=None):
+        """Sets the effectiveness matrices and derived properties (ranks, Gram matrices, eigenvalues and
+           null space of Bm). Derived properties which are given, e.g. computed for a whole batch, are not recomputed.
+        """
+        self.w_hat_bounds = np.array((0.02, 1))
+
+        self.Bf = Bf
+        self.Bm = Bm
+        
+        self.rank_f = np.linalg.matrix_rank(self.Bf) if rank_f is None else rank_f
+        self.rank_m = np.linalg.matrix_rank(self.Bm) if rank_m is None else rank_m
+        
+        self.gram_f = self.Bf @ self.Bf.T if gram_f is None else gram_f
+        self.gram_m = self.Bm @ self.Bm.T if gram_m is None else gram_m
+        
+        self.eig_f = np.linalg.eigvals(self.gram_f) if eig_f is None else eig_f
+        self.eig_m = np.linalg.eigvals(self.gram_m) if eig_m is None else eig_m
+        
+        # Constant matrices of the quadratic force and moment constraints
+        self.A_f = self.Bf.T @ self.Bf
+        self.A_m = self.Bm.T @ self.Bm
+        
+        # Orthonormal basis of the null space of Bm, i.e. all inputs that produce zero torque
+        self.null_m = null_space(self.Bm) if null_m is None else null_m
 
         self.W = np.eye(self.num_props)
         
@@ -68,49 +300,157 @@ class Hover:
         self.control_limits[:,1] *= self.w_hat_bounds[1]
         
         
-    def compute_hover(self, verbose=False, tol=1e-5):
+    def compute_hover(self, verbose=False, tol=1e-5, jac=True, n_starts=1, seed=None, workers=1, static_method="nullspace", cache=None, callback=None, screen=True, alpha_method="scaled", init="random", pool=None):
         """Calls the static function to check if drone is able to achieve static hover.
            If static hover fails, call spinning function.
+
+        Args:
+            verbose (bool, optional): Print hovering capabilities. Defaults to False.
+            tol (float, optional): Tolerance of the static hover optimization. Defaults to 1e-5.
+            jac (bool, optional): Supply analytic gradients to SLSQP instead of finite differences. Defaults to True.
+            n_starts (int, optional): Number of random initial guesses per hover mode. Defaults to 1.
+            seed (int, optional): Seed of the random initial guesses, for reproducible results. Defaults to None.
+            workers (int, optional): Number of processes over which the starts are distributed. Defaults to 1.
+            static_method (str, optional): Static hover solver, "nullspace" (reduced problem in the null space of Bm)
+                                           or "slsqp" (full problem with quadratic moment constraint). Defaults to "nullspace".
+            cache (HoverCache, optional): Cache from which solutions are restored and to which new solutions are stored. Defaults to None.
+            callback (callable, optional): Called as callback(phase, eta) after every SLSQP iteration, with phase "static" or "spinning".
+                                           Runs in the worker processes when the starts are distributed, so it must be
+                                           picklable there; with a callback that is not (e.g. a lambda) the starts run
+                                           serially. Defaults to None.
+            screen (bool, optional): Skip solves which cheap necessary conditions show to be infeasible (see screen and
+                                     torque_balance). A drone rejected up front has no best inputs, so eta, u and tau are None,
+                                     unlike drones which the solves find unable to hover. Defaults to True.
+            alpha_method (str, optional): Computation of the maximum thrust to weight ratio, "scaled" (hover inputs scaled until
+                                          one propeller saturates) or "lp" (maximum thrust along the hover direction with torque
+                                          condition, see max_thrust). Defaults to "scaled".
+            init (str, ndarray or WarmStartIndex, optional): Initial guess of the first start, "random", "min_norm"
+                                          (minimum-norm inputs with G along the thrust direction and zero torque),
+                                          "symmetric" (equal inputs), an explicit eta, or a WarmStartIndex of solved
+                                          designs which also receives this solution (see initial_guess). A warm start
+                                          from update_prop takes precedence over strategies given by name. Defaults to "random".
+            pool (Executor, optional): Process pool over which the starts are distributed instead of a pool of workers
+                                       processes started for this call, to share one pool between calls. Defaults to None.
+                                           
+        Returns:
+            HoverResult: Hover solution with solver telemetry.
         """      
+        if alpha_method not in ("scaled", "lp"):
+            raise ValueError(f"Invalid alpha method \"{alpha_method}\". Use only \"scaled\" or \"lp\"")
+        
+        self.rng = np.random.default_rng(seed)
+        self.alpha_method = alpha_method
+        self.multistart_stats = {}
+        self.timings = {"matrix_build": getattr(self, "build_time", 0.0)}
+        self.phases = {}
+        
+        if not (isinstance(init, str) and init == "random"):
+            from dronehover.initial_guess import initial_guess, WarmStartIndex
+            if getattr(self, "warm_eta", None) is None or not isinstance(init, (str, WarmStartIndex)):
+                self.warm_eta = initial_guess(init, self.Bf, self.Bm, self.w_hat_bounds)
+        
+        if cache is not None:
+            key = cache.key(self, tol, static_method=static_method, screen=screen, alpha_method=alpha_method,
+                            init=init if isinstance(init, str) else type(init).__name__, n_starts=n_starts, jac=jac,
+                            seed=np.asarray(seed).tolist() if isinstance(seed, (int, np.integer, list, tuple, np.ndarray)) else None)
+            if cache.load(self, key):
+                if verbose:
+                    print(f"Hover solution loaded from cache: {self.hover_status}")
+                return self.finish(init, cached=True)
+            t0 = time.perf_counter()
+        
         self.hover_status = None  
-        self.static(verbose, tol)
-        if self.static_success == False:
-            self.spinning(verbose, tol)
+        self.static_success = None
+        self.spinning_success = None
+        self.static_result = None
+        self.spinning_result = None
+        self.screen_reason = None
         
+        if screen:
+            t_screen = time.perf_counter()
+            can_hover, self.screen_reason = self.screen()
+            self.timings["screen"] = time.perf_counter() - t_screen
+        else:
+            can_hover = True
             
-    def static(self, verbose, tol):
+        if not can_hover:
+            self.hover_status = "N"
+            self.static_success = False
+            self.spinning_success = False
+            self.eta = None
+            self.u = None
+            self.tau = None
+            self.input_cost = None
+            self.alpha = None
+            if verbose:
+                print("----------Drone Cannot Hover----------")
+                print(self.screen_reason)
+        else:
+            if callback is not None and not _picklable(callback):
+                workers, pool = 1, None     # Traced starts run serially
+            own_pool = pool is None and workers > 1 and n_starts > 1
+            if own_pool:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                self.static(verbose, tol, jac, n_starts, workers, static_method, callback, pool, screen)
+                if self.static_success == False:
+                    self.spinning(verbose, tol, jac, n_starts, workers, callback, pool)
+            finally:
+                if own_pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+            
+            # A screened static phase does not explain a drone which hovers while spinning
+            if self.hover_status != "N":
+                self.screen_reason = None
+            
+        if cache is not None:
+            cache.store(self, key, time.perf_counter() - t0)
+            
+        return self.finish(init)
+    
+    
+    def finish(self, init, cached=False):
+        """Stores the solution in a WarmStartIndex given as init, clears the warm start and creates the result."""
+        if not isinstance(init, str) and hasattr(init, "add_hover"):
+            init.add_hover(self)
+            
+        self.warm_eta = None
+        self.result = HoverResult(self, cached=cached)
+        return self.result
+        
+            
+    def static(self, verbose, tol, jac=True, n_starts=1, workers=1, method="nullspace", callback=None, pool=None, screen=False):
         """Check if drone is able to achieve static hover.
            Prints hovering capability, optimal hovering inputs and input cost.
+           With screen, the solve is skipped when torque cannot be balanced within the input bounds (see torque_balance),
+           which is only checked when the closed form solution of the null space method is not within the bounds.
         """ 
+        if method not in ("nullspace", "slsqp"):
+            raise ValueError(f"Invalid static hover method \"{method}\". Use only \"nullspace\" or \"slsqp\"")
         if verbose:
             print("Testing static hover...")
             
-        A = self.Bf.T @ self.Bf
-        
-        # Defining eta as a shorthand (eta = w_hat**2)
-        eta0 = np.random.uniform(low=self.w_hat_bounds[0]**2, high=self.w_hat_bounds[1]**2, size=self.num_props)
-        
-        def objective_function(eta):
-            return eta.T @ eta
-        
-        def force_constraint(eta):
-            return eta.T @ A @ eta - G**2
-
-        def moment_constraint(eta):
-            return eta.T @ self.Bm.T @ self.Bm @ eta
-        
-        cons = [{"type":"eq", "fun":force_constraint},
-                {"type":"eq", "fun":moment_constraint}]
-        
-        bnds = []
-        for i in range(self.control_limits.shape[0]):
-            bnds.append((self.w_hat_bounds[0]**2, self.w_hat_bounds[1]**2)) 
-        opt = {'maxiter':1000, 'ftol':tol}
-        
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="Values in x were outside bounds")
-            static_hover = minimize(objective_function, eta0, constraints=cons, bounds=bnds, method='SLSQP', options=opt)
+        if screen:
+            t_screen = time.perf_counter()
+            eta = self.unbounded_static()[0] if method == "nullspace" else None
+            closed_form = eta is not None and np.all(eta >= self.w_hat_bounds[0]**2 - 1e-12) and np.all(eta <= self.w_hat_bounds[1]**2 + 1e-12)
+            balanced = closed_form or self.torque_balance()
+            self.timings["screen"] = self.timings.get("screen", 0.0) + time.perf_counter() - t_screen
+            if not balanced:
+                self.screen_reason = "Torque cannot be balanced within the input bounds"
+                self.static_success = False
+                if verbose:
+                    print(f"Drone cannot achieve static hover: {self.screen_reason}")
+                return
             
+        t0 = time.perf_counter()
+        if method == "nullspace":
+            static_hover = self.multistart("static", tol, jac, n_starts, workers, self.solve_static_nullspace, callback, pool)
+        else:
+            static_hover = self.multistart("static", tol, jac, n_starts, workers, callback=callback, pool=pool)
+        self.record_phase("static", static_hover, time.perf_counter() - t0)
+            
+        self.static_result = static_hover
         self.static_success = static_hover.success
         
         # Checking if no torque configuration can achieve sufficient thrust
@@ -123,10 +463,7 @@ class Hover:
             self.tau = self.Bm @ self.eta
             self.input_cost = self.eta.T @ self.eta
             
-            self.w_hat_max = self.w_hat / max(self.w_hat)
-            
-            self.f_max = self.Bf @ (self.w_hat_max)**2
-            self.alpha = norm(self.f_max)/G
+            self.max_thrust_to_weight("static")
             
             if verbose:
                 print("----------Static Hover Achieved----------")
@@ -144,44 +481,18 @@ class Hover:
                 print("Drone cannot achieve static hover")
 
     
-    def spinning(self, verbose, tol):
+    def spinning(self, verbose, tol, jac=True, n_starts=1, workers=1, callback=None, pool=None):
         """Check if drone is able to achieve spinning hover.
            Prints hovering capability, optimal hovering inputs and input cost.
         """        
         if verbose:
             print("Testing spinning hover...")
-        A = self.Bf.T @ self.Bf
-        
-        # Defining eta as a shorthand (eta = u**2)
-        # Somehow if values of u are all equal it does not work
-        eta0 = np.random.uniform(low=self.w_hat_bounds[0]**2, high=self.w_hat_bounds[1]**2, size=self.num_props)
-        
-        def objective_function(eta):
-            return eta.T @ eta
-        
-        def force_constraint(eta):
-            return eta.T @ A @ eta - G**2
-        
-        def moment_constraint(eta):
-            # This SLSQP constraint does not work for if cross(f,tau) always 0
-            # Constraint cannot be differentiated twice
-            # i.e. constraint automatically satisfied            
-            f = self.Bf @ eta
-            tau = self.Bm @ eta
-            return norm(np.cross(f, tau))
-        
-        cons = [{"type":"eq", "fun":force_constraint},
-                {"type":"eq", "fun":moment_constraint}]
-        
-        bnds = []
-        for i in range(self.control_limits.shape[0]):
-            bnds.append((self.w_hat_bounds[0]**2, self.w_hat_bounds[1]**2)) 
-        opt = {'maxiter':1000, 'ftol':5e-3}
-        
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="Values in x were outside bounds")
-            spinning_hover = minimize(objective_function, eta0, constraints=cons, bounds=bnds, method='SLSQP', options=opt)
+            
+        t0 = time.perf_counter()
+        spinning_hover = self.multistart("spinning", tol, jac, n_starts, workers, callback=callback, pool=pool)
+        self.record_phase("spinning", spinning_hover, time.perf_counter() - t0)
         
+        self.spinning_result = spinning_hover
         self.spinning_success = spinning_hover.success
         
         if spinning_hover.success == True:
@@ -193,11 +504,7 @@ class Hover:
             self.tau = self.Bm @ self.eta
             self.input_cost = self.eta.T @ self.eta
             
-            self.w_hat_max = self.w_hat / max(self.w_hat)
-            
-            self.f_max = self.Bf @ (self.w_hat_max)**2
-            
-            self.alpha = norm(self.f_max)/G
+            self.max_thrust_to_weight("spinning")
             
             if verbose:
                 print("----------Spinning Hover Achieved----------")
@@ -226,6 +533,430 @@ class Hover:
                 print(f'Resultant specific force: {norm(f):.2f}')
                 print(f'Resultant specific torque: {norm(self.tau):.2f}')
                 print(f"Force-torque cross product norm: {norm(np.cross(f,self.tau)):.5f}")
+                
+                
+    def multistart(self, mode, tol, jac=True, n_starts=1, workers=1, solve=None, callback=None, pool=None):
+        """Solves a hover problem from several random initial guesses.
+           Stops as soon as a start reaches the certified optimum (the input cost lower bound).
+           The spread of the input cost across starts is stored in multistart_stats.
+
+        Args:
+            mode (str): "static" or "spinning".
+            tol (float): Tolerance of the optimization.
+            jac (bool, optional): Supply analytic gradients to SLSQP. Defaults to True.
+            n_starts (int, optional): Number of initial guesses. Defaults to 1.
+            workers (int, optional): Number of processes over which the starts are distributed. Defaults to 1.
+            solve (callable, optional): Solver taking (eta0, tol, jac, callback). Defaults to the SLSQP solver of the mode.
+            callback (callable, optional): Called as callback(mode, eta) after every SLSQP iteration. Defaults to None.
+            pool (Executor, optional): Process pool over which the starts are distributed. Defaults to None
+                                       (a pool of workers processes, shut down without waiting for starts in flight).
+
+        Returns:
+            OptimizeResult: Best solution found over all starts.
+        """
+        if not hasattr(self, "rng"):
+            self.rng = np.random.default_rng()
+        if not hasattr(self, "multistart_stats"):
+            self.multistart_stats = {}
+            
+        if solve is None:
+            solve = self.solve_static if mode == "static" else self.solve_spinning
+        
+        # Defining eta as a shorthand (eta = w_hat**2)
+        # Somehow if values of u are all equal it does not work
+        eta0s = self.rng.uniform(low=self.w_hat_bounds[0]**2, high=self.w_hat_bounds[1]**2, size=(n_starts, self.num_props))
+        
+        warm_eta = getattr(self, "warm_eta", None)
+        if warm_eta is not None and len(warm_eta) == self.num_props:
+            eta0s[0] = np.clip(warm_eta, self.w_hat_bounds[0]**2, self.w_hat_bounds[1]**2)
+        
+        lower_bound = self.cost_lower_bound()
+        def certified(result):
+            if result.get("certified", False):
+                return True
+            return result.success and result.fun <= lower_bound * (1 + max(tol, 1e-6))
+        
+        results = []
+        parallel = n_starts > 1 and (pool is not None or workers > 1)
+        if parallel and callback is not None and not _picklable(callback):
+            parallel = False    # Callbacks which cannot be sent to the workers are run with serial starts
+        if parallel:
+            executor = ProcessPoolExecutor(max_workers=workers) if pool is None else pool
+            futures = [executor.submit(solve, eta0, tol, jac, callback) for eta0 in eta0s]
+            try:
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if certified(results[-1]):
+                        break
+            finally:
+                # Starts which are still running are not waited for
+                for pending in futures:
+                    pending.cancel()
+                if pool is None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for eta0 in eta0s:
+                results.append(solve(eta0, tol, jac, callback))
+                if certified(results[-1]):
+                    break
+                
+        successful = [result for result in results if result.success]
+        if successful:
+            best = min(successful, key=lambda result: result.fun)
+        else:
+            best = min(results, key=lambda result: np.abs(self.constraint_residuals(mode, result.x)).max())
+            
+        costs = np.array([result.fun if result.success else np.nan for result in results])
+        self.multistart_stats[mode] = {"starts": len(results),
+                                       "success_rate": len(successful)/len(results),
+                                       "costs": costs,
+                                       "spread": np.nanmax(costs) - np.nanmin(costs) if successful else np.nan,
+                                       "certified": certified(best),
+                                       "nfev": sum(int(result.get("nfev", 0)) for result in results),
+                                       "njev": sum(int(result.get("njev", 0)) for result in results),
+                                       "nit": sum(int(result.get("nit", 0)) for result in results)}
+        return best
+    
+    
+    def record_phase(self, mode, result, elapsed):
+        """Stores the telemetry of a hover phase (static or spinning)."""
+        stats = self.multistart_stats[mode]
+        self.timings[mode] = elapsed
+        self.phases[mode] = {"success": bool(result.success),
+                             "message": str(result.message),
+                             "nfev": stats["nfev"],
+                             "njev": stats["njev"],
+                             "nit": stats["nit"],
+                             "starts": stats["starts"],
+                             "certified": bool(stats["certified"]),
+                             "residuals": self.constraint_residuals(mode, result.x)}
+    
+    
+    def solve_static(self, eta0, tol, jac=True, callback=None):
+        """Solves the static hover problem with SLSQP from a given initial guess.
+
+        Returns:
+            OptimizeResult: Result of scipy.optimize.minimize.
+        """
+        A = self.A_f
+        
+        def objective_function(eta):
+            return eta.T @ eta
+        
+        def objective_jac(eta):
+            return 2*eta
+        
+        def force_constraint(eta):
+            return eta.T @ A @ eta - G**2
+        
+        def force_jac(eta):
+            return 2*A @ eta
+
+        def moment_constraint(eta):
+            return eta.T @ self.A_m @ eta
+        
+        def moment_jac(eta):
+            return 2*self.A_m @ eta
+        
+        cons = [{"type":"eq", "fun":force_constraint},
+                {"type":"eq", "fun":moment_constraint}]
+        
+        if jac:
+            cons[0]["jac"] = force_jac
+            cons[1]["jac"] = moment_jac
+        
+        bnds = []
+        for i in range(self.control_limits.shape[0]):
+            bnds.append((self.w_hat_bounds[0]**2, self.w_hat_bounds[1]**2)) 
+        opt = {'maxiter':1000, 'ftol':tol}
+        
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="Values in x were outside bounds")
+            return minimize(objective_function, eta0, jac=objective_jac if jac else None,
+                            constraints=cons, bounds=bnds, method='SLSQP', options=opt,
+                            callback=None if callback is None else lambda eta: callback("static", eta))
+            
+            
+    def solve_static_nullspace(self, eta0, tol, jac=True, callback=None):
+        """Solves the static hover problem reduced to the null space of Bm.
+        
+           Zero torque is the linear constraint Bm @ eta = 0, so eta = N @ z with N an orthonormal basis of the null space.
+           Without bounds the optimum is the dominant right singular vector of Bf @ N scaled to produce G, which is
+           accepted directly when it lies within the bounds. Otherwise the small reduced problem in z is solved with SLSQP.
+
+        Returns:
+            OptimizeResult: Result in terms of eta.
+        """
+        N = self.null_m
+        lb = self.w_hat_bounds[0]**2
+        ub = self.w_hat_bounds[1]**2
+        
+        # Closed form solution without input bounds
+        eta, message = self.unbounded_static()
+        if eta is None:
+            return OptimizeResult(x=np.asarray(eta0, dtype=float), fun=np.inf, success=False, status=-1, nfev=0, njev=0, nit=0,
+                                  message=message)
+        if np.all(eta >= lb - 1e-12) and np.all(eta <= ub + 1e-12):
+            eta = np.clip(eta, lb, ub)
+            return OptimizeResult(x=eta, fun=eta.T @ eta, success=True, status=0, nfev=0, njev=0, nit=0, certified=True,
+                                  message="Closed form solution in null space of moment matrix")
+        
+        M = self.Bf @ N
+        A = M.T @ M
+        
+        def objective_function(z):
+            return z.T @ z
+        
+        def objective_jac(z):
+            return 2*z
+        
+        def force_constraint(z):
+            return z.T @ A @ z - G**2
+        
+        def force_jac(z):
+            return 2*A @ z
+        
+        cons = [{"type":"eq", "fun":force_constraint},
+                {"type":"ineq", "fun":lambda z: N @ z - lb},
+                {"type":"ineq", "fun":lambda z: ub - N @ z}]
+        
+        if jac:
+            cons[0]["jac"] = force_jac
+            cons[1]["jac"] = lambda z: N
+            cons[2]["jac"] = lambda z: -N
+            
+        opt = {'maxiter':1000, 'ftol':tol}
+        
+        z0 = N.T @ eta0
+        if norm(M @ z0) > 0:
+            z0 = z0 * G / norm(M @ z0)    # Scale initial guess to produce G
+        
+        reduced = minimize(objective_function, z0, jac=objective_jac if jac else None,
+                           constraints=cons, method='SLSQP', options=opt,
+                           callback=None if callback is None else lambda z: callback("static", N @ z))
+        
+        reduced.x = N @ reduced.x
+        return reduced
+    
+    
+    def unbounded_static(self):
+        """Computes the static hover solution without input bounds, the dominant right singular vector of Bf @ N
+           scaled to produce G, with N an orthonormal basis of the null space of Bm.
+
+        Returns:
+            tuple: eta (None if no thrust can be produced without torque) and the reason if None (str or None).
+        """
+        N = self.null_m
+        if N.shape[1] == 0:
+            return None, "Moment matrix has no null space, torque cannot be balanced"
+        
+        _, S, Vt = np.linalg.svd(self.Bf @ N)
+        if S.size == 0 or S[0] <= 1e-12 * max(norm(self.Bf), 1):
+            return None, "No thrust can be produced without torque"
+        
+        eta = N @ Vt[0] * G / S[0]
+        return (-eta if eta.sum() < 0 else eta), None
+    
+    
+    def solve_spinning(self, eta0, tol, jac=True, callback=None):
+        """Solves the spinning hover problem with SLSQP from a given initial guess.
+
+        Returns:
+            OptimizeResult: Result of scipy.optimize.minimize.
+        """
+        A = self.A_f
+        
+        def objective_function(eta):
+            return eta.T @ eta
+        
+        def objective_jac(eta):
+            return 2*eta
+        
+        def force_constraint(eta):
+            return eta.T @ A @ eta - G**2
+        
+        def force_jac(eta):
+            return 2*A @ eta
+        
+        def moment_constraint(eta):
+            # This SLSQP constraint does not work for if cross(f,tau) always 0
+            # Constraint cannot be differentiated twice
+            # i.e. constraint automatically satisfied            
+            f = self.Bf @ eta
+            tau = self.Bm @ eta
+            return norm(np.cross(f, tau))
+        
+        def moment_jac(eta):
+            f = self.Bf @ eta
+            tau = self.Bm @ eta
+            c = np.cross(f, tau)
+            c_norm = norm(c)
+            if c_norm == 0:
+                return np.zeros(self.num_props)
+            # Derivative of cross(f, tau) with respect to each eta, shape (P, 3)
+            dc = np.cross(self.Bf.T, tau) + np.cross(f, self.Bm.T)
+            return dc @ c / c_norm
+        
+        cons = [{"type":"eq", "fun":force_constraint},
+                {"type":"eq", "fun":moment_constraint}]
+        
+        if jac:
+            cons[0]["jac"] = force_jac
+            cons[1]["jac"] = moment_jac
+        
+        bnds = []
+        for i in range(self.control_limits.shape[0]):
+            bnds.append((self.w_hat_bounds[0]**2, self.w_hat_bounds[1]**2)) 
+        opt = {'maxiter':1000, 'ftol':5e-3}
+        
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="Values in x were outside bounds")
+            return minimize(objective_function, eta0, jac=objective_jac if jac else None,
+                            constraints=cons, bounds=bnds, method='SLSQP', options=opt,
+                            callback=None if callback is None else lambda eta: callback("spinning", eta))
+        
+        
+    def max_thrust_to_weight(self, mode):
+        """Computes the maximum thrust to weight ratio alpha of the current hover solution.
+        
+           With alpha_method "scaled", the hover inputs are scaled until the largest reaches its maximum.
+           With alpha_method "lp", the maximum specific force along the hover thrust direction is found
+           with a linear program that keeps the torque condition of the hover mode (see max_thrust).
+        """
+        if getattr(self, "alpha_method", "scaled") == "lp":
+            f = self.Bf @ self.eta
+            f_max, eta_max = max_thrust(self.Bf, self.Bm, f/norm(f), self.w_hat_bounds, static=mode == "static")
+            if np.isfinite(f_max):
+                self.w_hat_max = np.sqrt(eta_max)
+                self.f_max = self.Bf @ eta_max
+                self.alpha = f_max/G
+                return
+        
+        self.w_hat_max = self.w_hat / max(self.w_hat)
+        
+        self.f_max = self.Bf @ (self.w_hat_max)**2
+        self.alpha = norm(self.f_max)/G
+        
+        
+    def attainable_set(self, kind="moment"):
+        """Computes the attainable set of specific moments or forces over the input bounds (see attainable_set).
+           The margin is measured from the hover solution, and is NaN before compute_hover or when the drone cannot hover.
+
+        Args:
+            kind (str, optional): "moment" (Bm) or "force" (Bf). Defaults to "moment".
+
+        Returns:
+            dict: Center, facet normals and offsets, volume and margin of the attainable set.
+        """
+        B = _effectiveness(self, kind)
+        eta = getattr(self, "eta", None)
+        return attainable_set(B, self.w_hat_bounds, point=None if eta is None else B @ eta)
+        
+        
+    def failure_analysis(self, k=1, workers=1, **hover_kwargs):
+        """Computes the hovering capabilities after the failure of every combination of k propellers.
+           Each degraded drone is obtained by deleting the failed columns of Bf and Bm, and is warm-started
+           from the current hover inputs of the remaining propellers (if compute_hover was run).
+
+        Args:
+            k (int, optional): Number of failed propellers. Defaults to 1.
+            workers (int, optional): Number of processes over which the failure cases are distributed. Defaults to 1.
+            **hover_kwargs: Keyword arguments passed to compute_hover of every failure case.
+
+        Raises:
+            ValueError: k is not between 1 and the number of propellers minus 1.
+
+        Returns:
+            dict: Columnar results with "failed" (C, k) indices of the failed propellers, "status" (C,), "alpha" (C,),
+                  "input_cost" (C,) and "u" (C, P), NaN for failed propellers and drones that cannot hover.
+        """
+        if not 1 <= k < self.num_props:
+            raise ValueError(f"Number of failed propellers must be between 1 and {self.num_props - 1}")
+        
+        failed = np.array(list(combinations(range(self.num_props), k)), dtype=int)
+        eta = getattr(self, "eta", None)
+        cases = [(np.delete(self.Bf, f, axis=1), np.delete(self.Bm, f, axis=1),
+                  None if eta is None else np.delete(eta, f), hover_kwargs) for f in failed]
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_failure_case, cases, chunksize=max(1, len(cases)//(4*workers))))
+        else:
+            outcomes = [_failure_case(case) for case in cases]
+            
+        results = {"failed": failed,
+                   "status": np.array([outcome[0] for outcome in outcomes], dtype="<U2"),
+                   "alpha": np.array([outcome[1] for outcome in outcomes]),
+                   "input_cost": np.array([outcome[2] for outcome in outcomes]),
+                   "u": np.full((len(failed), self.num_props), np.nan)}
+        for i, f in enumerate(failed):
+            results["u"][i, np.setdiff1d(np.arange(self.num_props), f)] = outcomes[i][3]
+        return results
+        
+        
+    def screen(self):
+        """Checks a cheap necessary condition for hovering before any solve, in O(P).
+           Each propeller contributes at most norm(Bf[:, j]) * w_hat_max**2 to the specific force,
+           so hovering is impossible when the sum over all propellers is below G.
+
+        Returns:
+            tuple: Hover possible (bool) and the reason if not (str or None).
+        """
+        max_force = norm(self.Bf, axis=0).sum() * self.w_hat_bounds[1]**2
+        if max_force < G:
+            return False, f"Maximum specific force {max_force:.2f} is below gravitational acceleration"
+        return True, None
+    
+    
+    def torque_balance(self):
+        """Checks whether Bm @ eta = 0 has a solution within the input bounds, which static hover needs.
+           With a null space of Bm of dimension 0 or 1 this is decided directly, otherwise with a linear program,
+           which costs milliseconds, so static only runs it before falling back to an SLSQP solve.
+
+        Returns:
+            bool: Torque can be balanced within the input bounds.
+        """
+        lb = self.w_hat_bounds[0]**2
+        ub = self.w_hat_bounds[1]**2
+        
+        N = self.null_m
+        if N.shape[1] == 0:
+            return False
+        if N.shape[1] == 1:
+            # Zero torque inputs are the multiples of a single vector, which must be scalable into the bounds
+            n = N[:, 0] if N[:, 0].sum() >= 0 else -N[:, 0]
+            return n.min() > 0 and n.max() * lb <= n.min() * ub
+        
+        lp = linprog(np.zeros(self.num_props), A_eq=self.Bm, b_eq=np.zeros(3), bounds=(lb, ub), method="highs")
+        return lp.status != 2
+    
+    
+    def constraint_residuals(self, mode, eta):
+        """Computes the force and moment constraint residuals of a hover problem.
+
+        Args:
+            mode (str): "static" or "spinning".
+            eta (ndarray): Squared normalized propeller angular velocities.
+
+        Returns:
+            ndarray: Force and moment constraint residuals.
+        """
+        f = self.Bf @ eta
+        tau = self.Bm @ eta
+        if mode == "static":
+            return np.array([f @ f - G**2, tau @ tau])
+        return np.array([f @ f - G**2, norm(np.cross(f, tau))])
+    
+    
+    def cost_lower_bound(self):
+        """Lower bound of the input cost of any hovering solution.
+           Follows from norm(Bf @ eta) <= sigma_max(Bf) * norm(eta) and the lower input bound.
+        """
+        sigma_max_sq = max(np.max(np.real(self.eig_f)), 0)
+        bound = self.num_props * self.w_hat_bounds[0]**4
+        if sigma_max_sq == 0:
+            return np.inf
+        return max(G**2 / sigma_max_sq, bound)
             
             
     def drone_checker(self):
@@ -250,4 +981,190 @@ class Hover:
         return (w_hat - 0.02)/0.98
     
     def u_to_w(self, u):
-        return 0.02 + 0.98*u
\ No newline at end of file
+        return 0.02 + 0.98*u
+
+
+class HoverResult:
+    def __init__(self, hover, cached=False):
+        """Result of Hover.compute_hover, with the hover solution and solver telemetry.
+
+        Args:
+            hover (Hover): Hover optimizer after compute_hover.
+            cached (bool, optional): Solution was restored from a cache. Defaults to False.
+        """
+        self.hover_status = hover.hover_status
+        self.eta = hover.eta
+        self.u = hover.u
+        self.tau = hover.tau
+        self.alpha = hover.alpha
+        self.input_cost = hover.input_cost
+        self.reason = getattr(hover, "screen_reason", None)      # Reason given by the pre-screen if the drone cannot hover
+        self.cached = cached
+        
+        self.timings = dict(hover.timings)      # seconds, per phase ("matrix_build", "static", "spinning")
+        self.phases = dict(hover.phases)        # nfev, njev, nit, message, residuals, ... per phase
+        
+    @property
+    def total_time(self):
+        return sum(self.timings.values())
+        
+    def as_dict(self):
+        """Converts the result into JSON-serializable types."""
+        def convert(value):
+            if isinstance(value, dict):
+                return {key: convert(v) for key, v in value.items()}
+            if isinstance(value, np.ndarray):
+                return value.tolist()
+            if isinstance(value, np.generic):
+                return value.item()
+            return value
+        
+        return convert({"hover_status": self.hover_status, "eta": self.eta, "u": self.u, "alpha": self.alpha,
+                        "input_cost": self.input_cost, "reason": self.reason, "cached": self.cached, "timings": self.timings, "phases": self.phases})
+    
+    def __repr__(self):
+        return f"HoverResult(hover_status={self.hover_status!r}, alpha={self.alpha}, input_cost={self.input_cost}, total_time={self.total_time:.4f})"
+
+
+def _failure_case(case):
+    """Solves one failure case of Hover.failure_analysis.
+
+    Returns:
+        tuple: Hover status, alpha, input cost and inputs u of the remaining propellers (NaN if not hovering).
+    """
+    Bf, Bm, warm_eta, hover_kwargs = case
+    hover = Hover.from_matrices(Bf, Bm)
+    hover.warm_eta = warm_eta
+    hover.compute_hover(**hover_kwargs)
+    if hover.alpha is None:
+        return hover.hover_status, np.nan, np.nan, np.full(hover.num_props, np.nan)
+    return hover.hover_status, hover.alpha, hover.input_cost, hover.u
+
+
+def _effectiveness(hover, kind):
+    if kind == "moment":
+        return hover.Bm
+    if kind == "force":
+        return hover.Bf
+    raise ValueError(f"Invalid attainable set \"{kind}\". Use only \"moment\" or \"force\"")
+
+
+class BatchHover:
+    def __init__(self, loc, direction, rot, constants, wmax, mass, cg, inertia):
+        """Hover optimizer for a batch of N drones with the same number of propellers P.
+           Effectiveness matrices, ranks, Gram matrices and eigenvalues are computed for all drones at once.
+
+        Args:
+            loc (ndarray): Propeller locations in body-fixed axis, shape (N, P, 3).
+            direction (ndarray): Thrust directions, shape (N, P, 3).
+            rot (ndarray): Propeller rotation, -1 for "ccw" and 1 for "cw", shape (N, P).
+            constants (ndarray): Force and moment constants, shape (N, P, 2).
+            wmax (ndarray): Maximum propeller angular velocity, shape (N, P).
+            mass (ndarray): Drone masses, shape (N,).
+            cg (ndarray): C.G. locations, shape (N, 3).
+            inertia (ndarray): Inertia tensors, shape (N, 3, 3).
+        """
+        self.Bf, self.Bm = effectiveness_matrices(np.asarray(loc, dtype=float), np.asarray(direction, dtype=float),
+                                                  np.asarray(rot, dtype=float), np.asarray(constants, dtype=float),
+                                                  np.asarray(wmax, dtype=float), np.asarray(mass, dtype=float),
+                                                  np.asarray(cg, dtype=float), np.asarray(inertia, dtype=float))
+        
+        self.num_designs, _, self.num_props = self.Bf.shape
+        
+        self.w_hat_bounds = np.array((0.02, 1))
+        
+        self.rank_f = np.linalg.matrix_rank(self.Bf)
+        
+        # Rank and null space of Bm from one batched SVD, with the tolerance of matrix_rank and null_space
+        _, S, Vt = np.linalg.svd(self.Bm)
+        tol = S.max(axis=-1, initial=0) * max(self.Bm.shape[1:]) * np.finfo(float).eps
+        self.rank_m = (S > tol[:, np.newaxis]).sum(axis=-1)
+        self.null_m = [Vt[i, r:].T for i, r in enumerate(self.rank_m)]
+        
+        self.gram_f = self.Bf @ np.swapaxes(self.Bf, -1, -2)
+        self.gram_m = self.Bm @ np.swapaxes(self.Bm, -1, -2)
+        
+        self.eig_f = np.linalg.eigvals(self.gram_f)
+        self.eig_m = np.linalg.eigvals(self.gram_m)
+        
+    @classmethod
+    def from_drones(cls, drones):
+        """Creates a batch hover optimizer from a list of drone classes.
+
+        Args:
+            drones (list): Drone classes containing inertial properties and propeller configurations.
+            
+        Raises:
+            ValueError: Drones do not have the same number of propellers.
+        """
+        num_props = {len(drone.props) for drone in drones}
+        if len(num_props) != 1:
+            raise ValueError("All drones in a batch must have the same number of propellers")
+        
+        arrays = [prop_arrays(drone.props) for drone in drones]
+        loc, direction, rot, constants, wmax = [np.stack(a) for a in zip(*arrays)]
+        mass = np.array([drone.mass for drone in drones], dtype=float)
+        cg = np.array([drone.cg for drone in drones], dtype=float)
+        inertia = np.array([[[drone.Ix, drone.Ixy, drone.Ixz],
+                             [drone.Ixy, drone.Iy, drone.Iyz],
+                             [drone.Ixz, drone.Iyz, drone.Iz]] for drone in drones], dtype=float)
+        return cls(loc, direction, rot, constants, wmax, mass, cg, inertia)
+        
+    def hover(self, i):
+        """Hover optimizer of design i, reusing the derived properties computed for the batch."""
+        return Hover.from_matrices(self.Bf[i], self.Bm[i], rank_f=self.rank_f[i], rank_m=self.rank_m[i],
+                                   gram_f=self.gram_f[i], gram_m=self.gram_m[i], eig_f=self.eig_f[i], eig_m=self.eig_m[i],
+                                   null_m=self.null_m[i])
+        
+    def compute_hover(self, verbose=False, tol=1e-5, seed=None, alpha_method="scaled"):
+        """Computes the hovering capabilities of every drone in the batch.
+           When a seed is given, each drone draws its initial guesses from a stream derived from (seed, index).
+           With alpha_method "lp", alpha of all hovering drones is computed by one batched linear program (see max_thrust).
+
+        Returns:
+            dict: Columnar results with "status" (N,), "eta" (N, P), "u" (N, P), "alpha" (N,) and "input_cost" (N,).
+                  "alpha" and "input_cost" are NaN for drones that cannot hover.
+        """
+        results = {"status": np.empty(self.num_designs, dtype="<U2"),
+                   "eta": np.full((self.num_designs, self.num_props), np.nan),
+                   "u": np.full((self.num_designs, self.num_props), np.nan),
+                   "alpha": np.full(self.num_designs, np.nan),
+                   "input_cost": np.full(self.num_designs, np.nan)}
+        
+        for i in range(self.num_designs):
+            if verbose:
+                print(f"Design {i+1}/{self.num_designs}")
+            hover = self.hover(i)
+            hover.compute_hover(verbose=verbose, tol=tol, seed=None if seed is None else [seed, i])
+            
+            results["status"][i] = hover.hover_status
+            if hover.eta is not None:
+                results["eta"][i] = hover.eta
+                results["u"][i] = hover.u
+            if hover.alpha is not None:
+                results["alpha"][i] = hover.alpha
+                results["input_cost"][i] = hover.input_cost
+                
+        if alpha_method == "lp":
+            hovering = np.flatnonzero(results["status"] != "N")
+            f = np.einsum("nip,np->ni", self.Bf[hovering], results["eta"][hovering])
+            f_max, _ = max_thrust(self.Bf[hovering], self.Bm[hovering], f/norm(f, axis=1, keepdims=True),
+                                  self.w_hat_bounds, static=results["status"][hovering] == "ST")
+            results["alpha"][hovering] = np.where(np.isfinite(f_max), f_max/G, results["alpha"][hovering])
+                
+        return results
+
+    def attainable_set(self, kind="moment", eta=None):
+        """Computes the attainable sets of specific moments or forces of all drones at once (see attainable_set).
+
+        Args:
+            kind (str, optional): "moment" (Bm) or "force" (Bf). Defaults to "moment".
+            eta (ndarray, optional): Hover inputs of each drone (e.g. "eta" from compute_hover), shape (N, P).
+                                     Margins are NaN when not given or NaN. Defaults to None.
+
+        Returns:
+            dict: Centers, facet normals and offsets, volumes and margins, batched over the drones.
+        """
+        B = _effectiveness(self, kind)
+        point = None if eta is None else np.einsum("nip,np->ni", B, eta)
+        return attainable_set(B, self.w_hat_bounds, point=point)
@@ -0,0 +1,212 @@
+import os
+import csv
+import json
+from functools import lru_cache
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "props.csv")
+
+# Columns of the propeller table. pitch and kv are NaN when unknown
+DTYPE = np.dtype([("name", "U32"), ("size", "f8"), ("pitch", "f8"), ("kv", "f8"),
+                  ("kf", "f8"), ("km", "f8"), ("wmax", "f8"), ("mass", "f8")])
+
+
+def _float(value):
+    return np.nan if value is None or value == "" else float(value)
+
+
+class PropLibrary:
+    def __init__(self, table):
+        """Table of measured propeller and motor combinations, sorted and indexed by size, pitch and motor KV.
+
+        Args:
+            table (ndarray): Structured array with dtype DTYPE. Memory-mapped arrays already sorted
+                             by (size, pitch, kv) are used without copying.
+        """
+        if table.dtype != DTYPE:
+            raise ValueError(f"Propeller table must have dtype {DTYPE}")
+
+        order = np.lexsort((table["kv"], table["pitch"], table["size"]))
+        if not np.array_equal(order, np.arange(len(table))):
+            table = table[order]
+        self.table = table
+
+    @classmethod
+    def load(cls, path):
+        """Loads a library from a .csv, .json or .npy file. .npy files are memory-mapped.
+
+        Raises:
+            ValueError: Unknown file extension.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            with open(path, newline="") as f:
+                return cls.from_records(csv.DictReader(f))
+        if extension == ".json":
+            with open(path) as f:
+                return cls.from_records(json.load(f))
+        if extension == ".npy":
+            return cls(np.load(path, mmap_mode="r"))
+        raise ValueError(f"Unknown propeller library format \"{extension}\". Use .csv, .json or .npy")
+
+    @classmethod
+    def from_records(cls, records):
+        """Creates a library from dictionaries with the columns of DTYPE. "constants": [kf, km] may replace kf and km."""
+        rows = []
+        for record in records:
+            kf, km = record["constants"] if "constants" in record else (record["kf"], record["km"])
+            rows.append((record.get("name", ""), _float(record["size"]), _float(record.get("pitch")), _float(record.get("kv")),
+                         _float(kf), _float(km), _float(record["wmax"]), _float(record["mass"])))
+        return cls(np.array(rows, dtype=DTYPE))
+
+    def save(self, path):
+        """Saves the sorted table as .npy, which can be memory-mapped by load."""
+        np.save(path, np.asarray(self.table))
+
+    def __len__(self):
+        return len(self.table)
+
+    def rows(self, pitch=None, kv=None):
+        """Rows matching the given pitch and motor KV."""
+        mask = np.ones(len(self.table), dtype=bool)
+        if pitch is not None:
+            mask &= np.isclose(self.table["pitch"], pitch)
+        if kv is not None:
+            mask &= np.isclose(self.table["kv"], kv)
+        return self.table[mask]
+
+    def lookup(self, sizes, pitch=None, kv=None):
+        """Finds the properties of propellers of the given sizes. Measured sizes are returned exactly, other sizes
+           are interpolated linearly in log-log space between the neighbouring measured sizes (constants, wmax and
+           mass roughly follow power laws of the diameter).
+
+        Args:
+            sizes (ndarray): Propeller sizes in inches, any shape.
+            pitch (float or ndarray, optional): Only use propellers with this pitch, per propeller if broadcastable
+                                                to sizes (NaN for any pitch). Defaults to None.
+            kv (float or ndarray, optional): Only use motors with this KV, per propeller as pitch. Defaults to None.
+
+        Raises:
+            ValueError: Sizes outside the measured range, or several propellers of the same size match.
+
+        Returns:
+            tuple: Constants [kf, km] (..., 2), maximum angular velocities (...) and masses (...).
+        """
+        sizes = np.asarray(sizes, dtype=float)
+        if np.ndim(pitch) or np.ndim(kv):
+            # Propellers with different pitch or KV, looked up per combination
+            pitch, kv = (np.broadcast_to(np.nan if value is None else np.asarray(value, dtype=float), sizes.shape)
+                         for value in (pitch, kv))
+            constants, wmax, mass = np.empty(sizes.shape + (2,)), np.empty(sizes.shape), np.empty(sizes.shape)
+            combinations = np.unique(np.stack([pitch.ravel(), kv.ravel()], axis=-1), axis=0)
+            for p, k in combinations:
+                mask = (np.isnan(pitch) if np.isnan(p) else pitch == p) & (np.isnan(kv) if np.isnan(k) else kv == k)
+                constants[mask], wmax[mask], mass[mask] = self.lookup(sizes[mask], p, k)
+            return constants, wmax, mass
+        pitch = None if pitch is None or np.isnan(pitch) else pitch
+        kv = None if kv is None or np.isnan(kv) else kv
+        rows = self.rows(pitch, kv) if pitch is not None or kv is not None else self.table
+        if len(rows) == 0:
+            raise ValueError(f"No propellers with pitch {pitch} and kv {kv} in the library")
+        known = np.asarray(rows["size"])
+        if np.any(known[1:] == known[:-1]):
+            raise ValueError("Several propellers of the same size match, specify pitch or kv")
+        if np.any(sizes < known[0]) or np.any(sizes > known[-1]):
+            raise ValueError(f"Propeller sizes outside the library range [{known[0]:g}, {known[-1]:g}] cannot be extrapolated")
+
+        log_sizes = np.log(sizes)
+        log_known = np.log(known)
+        index = np.searchsorted(known, sizes).clip(max=len(known) - 1)
+        exact = known[index] == sizes
+        def interp(column):
+            values = np.asarray(rows[column])
+            return np.where(exact, values[index], np.exp(np.interp(log_sizes, log_known, np.log(values))))
+
+        constants = np.stack([interp("kf"), interp("km")], axis=-1)
+        return constants, interp("wmax"), interp("mass")
+
+    def get(self, size, pitch=None, kv=None):
+        """Properties of a single propeller in the format of prop_lib.
+
+        Returns:
+            dict: "constants" [kf, km], "wmax" and "mass".
+        """
+        constants, wmax, mass = self.lookup(size, pitch, kv)
+        return {"constants": constants.tolist(), "wmax": float(wmax), "mass": float(mass)}
+
+    def query(self, sort_by=None, **limits):
+        """Selects propellers by limits on the columns, e.g. query(sort_by="mass", wmax_min=3000, size_max=6).
+
+        Args:
+            sort_by (str, optional): Column by which the result is sorted. Defaults to None (library order).
+            **limits: "<column>_min" or "<column>_max" bounds (inclusive), or "<column>" for an exact value.
+
+        Returns:
+            ndarray: Matching rows of the table.
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        for key, value in limits.items():
+            column, _, bound = key.rpartition("_")
+            if bound == "min" and column in DTYPE.names:
+                mask &= self.table[column] >= value
+            elif bound == "max" and column in DTYPE.names:
+                mask &= self.table[column] <= value
+            elif key in DTYPE.names:
+                mask &= self.table[key] == value
+            else:
+                raise ValueError(f"Invalid query \"{key}\"")
+
+        rows = self.table[mask]
+        if sort_by is not None:
+            rows = rows[np.argsort(rows[sort_by], kind="stable")]
+        return rows
+
+    def lightest(self, **limits):
+        """Lightest propeller satisfying the limits of query, e.g. lightest(wmax_min=3000).
+
+        Raises:
+            ValueError: No propeller satisfies the limits.
+        """
+        rows = self.query(sort_by="mass", **limits)
+        if len(rows) == 0:
+            raise ValueError(f"No propeller satisfies {limits}")
+        return rows[0]
+
+
+_default = None
+
+
+def default_library():
+    """Propeller library used when no library is given, the shipped data/props.csv unless replaced
+       with set_default_library."""
+    global _default
+    if _default is None:
+        _default = PropLibrary.load(DEFAULT_PATH)
+    return _default
+
+
+def set_default_library(library=None):
+    """Replaces the default library of this process, e.g. by a catalog of measured combinations.
+       Worker processes only inherit it when they are forked, pass library= to parallel evaluations instead.
+
+    Args:
+        library (PropLibrary or str, optional): Library or path of a library file (see PropLibrary.load).
+                                                Defaults to None (the shipped library).
+    """
+    global _default
+    _default = None if library is None else get_library(library)
+
+
+@lru_cache(maxsize=8)
+def _load(path):
+    return PropLibrary.load(path)
+
+
+def get_library(library=None):
+    """Resolves a library argument: a PropLibrary, the path of a library file (loaded once per process),
+       or None for the default library."""
+    if library is None:
+        return default_library()
+    if isinstance(library, PropLibrary):
+        return library
+    return _load(os.path.abspath(library))
@@ -0,0 +1,207 @@
+"""Local hover evaluation service.
+
+Serves JSON lines over a Unix socket or a localhost TCP port. Every request line is a JSON object:
+
+    {"id": 1, "design": {"props": [...]}, "options": {"seed": 0}}     evaluate a design (see cli.design_from_dict)
+    {"id": 2, "type": "metrics"}                                     queue depth, counters and latency percentiles
+
+and is answered by one JSON line with the same "id". Requests of a connection are handled concurrently,
+so responses may arrive out of order. Designs are solved in a warm process pool, and identical requests
+that arrive while a solve is in flight share its result.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from dronehover.cli import evaluate_design
+
+
+def _warm_up():
+    """Imports the optimizer in a worker process, so that the first request does not pay for it."""
+    import dronehover.optimization     # noqa: F401
+    import dronehover.bodies.custom_bodies      # noqa: F401
+
+
+def request_key(design, options):
+    """Key identifying identical requests, independent of the request id and of the key order."""
+    design = {key: value for key, value in design.items() if key != "id"}
+    data = json.dumps([design, options], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q/100 * len(values)))]
+
+
+class HoverService:
+    def __init__(self, workers=1, latency_window=10000):
+        """Hover evaluation service with a warm process pool and coalescing of identical in-flight requests.
+
+        Args:
+            workers (int, optional): Number of worker processes. Defaults to 1.
+            latency_window (int, optional): Number of recent requests from which latency percentiles are computed. Defaults to 10000.
+        """
+        self.workers = workers
+        self.pool = None
+        self.in_flight = {}
+        self.latencies = deque(maxlen=latency_window)
+        self.counters = {"requests": 0, "solves": 0, "coalesced": 0, "errors": 0}
+        self.queued = 0
+        self.started = time.time()
+
+    def start_pool(self):
+        """Starts the worker processes and imports the optimizer in each of them."""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        for future in [self.pool.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def evaluate(self, design, options):
+        """Evaluates a design, sharing the solve with identical requests that are already in flight."""
+        key = request_key(design, options)
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._solve(key, design, options))
+            self.in_flight[key] = task
+        else:
+            self.counters["coalesced"] += 1
+        return dict(await asyncio.shield(task))
+
+    async def _solve(self, key, design, options):
+        self.queued += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, evaluate_design, design, options)
+            self.counters["solves"] += 1
+            return result
+        finally:
+            self.queued -= 1
+            del self.in_flight[key]
+
+    def metrics(self):
+        latencies = list(self.latencies)
+        return {"queue_depth": self.queued,
+                "in_flight": len(self.in_flight),
+                "workers": self.workers,
+                "uptime": time.time() - self.started,
+                **self.counters,
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p99": _percentile(latencies, 99),
+                "latency_max": max(latencies) if latencies else None}
+
+    async def respond(self, line, writer):
+        """Answers one request line."""
+        t0 = time.perf_counter()
+        self.counters["requests"] += 1
+        request_id = None
+        try:
+            message = json.loads(line)
+            request_id = message.get("id")
+            if message.get("type", "evaluate") == "metrics":
+                response = self.metrics()
+            elif message.get("type", "evaluate") == "evaluate":
+                response = await self.evaluate(message["design"], message.get("options") or {})
+                if "error" in response:
+                    self.counters["errors"] += 1
+            else:
+                raise ValueError(f"Invalid request type \"{message['type']}\". Use only \"evaluate\" or \"metrics\"")
+        except Exception as e:
+            self.counters["errors"] += 1
+            response = {"error": f"{type(e).__name__}: {e}"}
+
+        response["id"] = request_id
+        self.latencies.append(time.perf_counter() - t0)
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        """Handles a connection, answering its request lines concurrently."""
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self.respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=8765):
+        """Serves requests on a Unix socket if socket_path is given, otherwise on host:port, until cancelled."""
+        if self.pool is None:
+            self.start_pool()
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+        # Shut down cleanly (removing the socket) when terminated
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+            if socket_path is not None and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+def request(messages, socket_path=None, host="127.0.0.1", port=8765, timeout=None):
+    """Sends request messages to a running service and waits for all responses.
+
+    Args:
+        messages (list): Request dictionaries (see module docstring).
+        socket_path (str, optional): Unix socket of the service. Defaults to None (use host and port).
+
+    Returns:
+        list: Response dictionaries, in order of arrival.
+    """
+    if socket_path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    else:
+        sock = socket.create_connection((host, port))
+    sock.settimeout(timeout)
+    with sock, sock.makefile("rw") as f:
+        for message in messages:
+            f.write(json.dumps(message) + "\n")
+        f.flush()
+        sock.shutdown(socket.SHUT_WR)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="dronehover-service", description="Local hover evaluation service (JSON lines).")
+    parser.add_argument("--socket", default=None, help="Unix socket path. Serves on --host/--port if not given")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    args = parser.parse_args(argv)
+
+    service = HoverService(workers=args.workers)
+    try:
+        asyncio.run(service.serve(socket_path=args.socket, host=args.host, port=args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from dronehover.optimization import Hover
+
+
+class Sweep:
+    def __init__(self, space, build, output, mode="grid", num_samples=None, seed=0, chunk_size=256, workers=1, hover_kwargs=None):
+        """Resumable design-space sweep. Designs are generated lazily, evaluated in chunks and every chunk is
+           written to its own .npz file in the output directory as soon as it finishes. Chunks already on disk
+           are skipped, so an interrupted sweep continues where it stopped when run again.
+
+        Args:
+            space (dict): Parameter space. For "grid", maps each parameter name to a list of values.
+                          For "random", maps each name to a (low, high) tuple (uniform) or a list of values (uniform choice).
+            build (callable): Function taking the parameters as keyword arguments and returning a drone class.
+                              Must be defined at module level when workers > 1.
+            output (str): Output directory.
+            mode (str, optional): "grid" or "random". Defaults to "grid".
+            num_samples (int, optional): Number of designs for "random" mode. Defaults to None.
+            seed (int, optional): Seed of the random designs and hover initial guesses. Defaults to 0.
+            chunk_size (int, optional): Number of designs per chunk. Defaults to 256.
+            workers (int, optional): Number of processes evaluating chunks. Defaults to 1.
+            hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover, except the seed,
+                                           which is derived from seed per design. Defaults to None.
+
+        Raises:
+            ValueError: Invalid mode, missing num_samples, or a seed in hover_kwargs.
+        """
+        if mode not in ("grid", "random"):
+            raise ValueError(f"Invalid sweep mode \"{mode}\". Use only \"grid\" or \"random\"")
+        if mode == "random" and num_samples is None:
+            raise ValueError("num_samples is required for random sweeps")
+        if hover_kwargs and "seed" in hover_kwargs:
+            raise ValueError("Pass the seed of the sweep as seed, not in hover_kwargs")
+
+        self.space = dict(space)
+        self.names = list(self.space.keys())
+        self.build = build
+        self.output = output
+        self.mode = mode
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.hover_kwargs = hover_kwargs or {}
+
+        if mode == "grid":
+            self.shape = tuple(len(self.space[name]) for name in self.names)
+            self.num_designs = int(np.prod(self.shape))
+        else:
+            self.num_designs = num_samples
+        self.num_chunks = -(-self.num_designs // self.chunk_size)
+
+    def spec(self):
+        """JSON-serializable description of the sweep, used to refuse resuming a different sweep."""
+        space = {name: [v if isinstance(v, str) else float(v) for v in values] for name, values in self.space.items()}
+        return {"space": space, "mode": self.mode, "num_designs": self.num_designs, "seed": self.seed,
+                "chunk_size": self.chunk_size, "hover_kwargs": repr(sorted(self.hover_kwargs.items()))}
+
+    def chunk_params(self, chunk):
+        """Generates the parameters of the designs in a chunk.
+
+        Returns:
+            tuple: Design indices (n,) and a dictionary of parameter columns (n,).
+        """
+        start = chunk * self.chunk_size
+        stop = min(start + self.chunk_size, self.num_designs)
+        index = np.arange(start, stop)
+
+        if self.mode == "grid":
+            subs = np.unravel_index(index, self.shape)
+            params = {name: np.asarray(self.space[name])[sub] for name, sub in zip(self.names, subs)}
+        else:
+            rng = np.random.default_rng([self.seed, chunk])
+            params = {}
+            for name in self.names:
+                values = self.space[name]
+                if isinstance(values, tuple):
+                    params[name] = rng.uniform(values[0], values[1], size=index.size)
+                else:
+                    params[name] = np.asarray(values)[rng.integers(len(values), size=index.size)]
+        return index, params
+
+    def chunk_path(self, chunk):
+        return os.path.join(self.output, f"chunk_{chunk:06d}.npz")
+
+    def pending_chunks(self):
+        """Chunks which have not been written to the output directory yet."""
+        return [chunk for chunk in range(self.num_chunks) if not os.path.exists(self.chunk_path(chunk))]
+
+    def evaluate_chunk(self, chunk):
+        """Evaluates all designs in a chunk and writes the results to disk.
+           A design which fails to build or solve is recorded with status "N" and its error message,
+           so that it does not stop the sweep.
+
+        Returns:
+            int: Chunk index.
+        """
+        index, params = self.chunk_params(chunk)
+        results = {"status": [], "alpha": [], "input_cost": [], "u": [], "error": []}
+        for i, idx in enumerate(index):
+            try:
+                drone = self.build(**{name: params[name][i].item() for name in self.names})
+                sim = Hover(drone)
+                sim.compute_hover(seed=[self.seed, int(idx)], **self.hover_kwargs)
+            except Exception as e:
+                results["status"].append("N")
+                results["alpha"].append(np.nan)
+                results["input_cost"].append(np.nan)
+                results["u"].append(np.empty(0))
+                results["error"].append(f"{type(e).__name__}: {e}")
+                continue
+            results["status"].append(sim.hover_status)
+            results["alpha"].append(np.nan if sim.alpha is None else sim.alpha)
+            results["input_cost"].append(np.nan if sim.input_cost is None else sim.input_cost)
+            results["u"].append(np.full(len(drone.props), np.nan) if sim.u is None else sim.u)
+            results["error"].append("")
+
+        # Pad inputs of drones with fewer propellers
+        num_props = max(len(u) for u in results["u"])
+        u = np.full((index.size, num_props), np.nan)
+        for i, ui in enumerate(results["u"]):
+            u[i, :len(ui)] = ui
+
+        tmp = os.path.join(self.output, f"chunk_{chunk:06d}.tmp.npz")
+        np.savez(tmp, index=index, status=np.array(results["status"]), alpha=np.array(results["alpha"]),
+                 input_cost=np.array(results["input_cost"]), u=u, error=np.array(results["error"]), **{f"param_{name}": params[name] for name in self.names})
+        os.replace(tmp, self.chunk_path(chunk))    # Chunk only counts as done once fully written
+        return chunk
+
+    def run(self, verbose=False):
+        """Evaluates all pending chunks, streaming each finished chunk to disk.
+
+        Raises:
+            ValueError: Output directory contains a different sweep.
+        """
+        os.makedirs(self.output, exist_ok=True)
+        spec_path = os.path.join(self.output, "sweep.json")
+        if os.path.exists(spec_path):
+            with open(spec_path) as f:
+                if json.load(f) != self.spec():
+                    raise ValueError(f"\"{self.output}\" contains results of a different sweep")
+        else:
+            with open(spec_path, "w") as f:
+                json.dump(self.spec(), f, indent=2)
+
+        pending = self.pending_chunks()
+        if verbose:
+            print(f"{self.num_chunks - len(pending)}/{self.num_chunks} chunks already done")
+
+        done = self.num_chunks - len(pending)
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # Keep a bounded number of chunks in flight so designs are generated lazily
+                pending = iter(pending)
+                running = set()
+                while True:
+                    for chunk in pending:
+                        running.add(pool.submit(self.evaluate_chunk, chunk))
+                        if len(running) >= 2*self.workers:
+                            break
+                    if not running:
+                        break
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        future.result()
+                        done += 1
+                        if verbose:
+                            print(f"{done}/{self.num_chunks} chunks done")
+        else:
+            for chunk in pending:
+                self.evaluate_chunk(chunk)
+                done += 1
+                if verbose:
+                    print(f"{done}/{self.num_chunks} chunks done")
+
+        return load_results(self.output)
+
+
+def load_results(output):
+    """Loads all finished chunks of a sweep.
+
+    Args:
+        output (str): Output directory of the sweep.
+
+    Returns:
+        dict: Result columns ordered by design index. Parameters are stored as "param_<name>",
+              and "error" holds the error message of designs which failed to build or solve ("" otherwise).
+    """
+    files = sorted(f for f in os.listdir(output) if f.startswith("chunk_") and not f.endswith(".tmp.npz"))
+    chunks = []
+    for f in files:
+        with np.load(os.path.join(output, f)) as data:
+            chunks.append({key: data[key] for key in data.files})
+    if not chunks:
+        return {}
+
+    num_props = max(chunk["u"].shape[1] for chunk in chunks)
+    for chunk in chunks:
+        chunk.setdefault("error", np.full(len(chunk["index"]), ""))     # Chunks written without error column
+        pad = num_props - chunk["u"].shape[1]
+        chunk["u"] = np.pad(chunk["u"], ((0, 0), (0, pad)), constant_values=np.nan)
+
+    return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
@@ -0,0 +1,221 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+
+from dronehover.optimization import Hover, prop_arrays, effectiveness_matrices
+
+STATUSES = ("ST", "SP", "N")
+
+
+class RunningStats:
+    def __init__(self, bins):
+        """Streaming mean, variance, extrema and histogram of a scalar (Welford's algorithm).
+           Partial statistics of separate chunks are combined with merge.
+
+        Args:
+            bins (ndarray): Histogram bin edges. Values outside the edges are counted in "below" and "above".
+        """
+        self.bins = np.asarray(bins, dtype=float)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.histogram = np.zeros(len(self.bins) - 1, dtype=int)
+        self.below = 0
+        self.above = 0
+
+    def update(self, values):
+        """Adds an array of values, NaN values are ignored."""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return
+        other = RunningStats(self.bins)
+        other.count = values.size
+        other.mean = values.mean()
+        other.m2 = np.sum((values - other.mean)**2)
+        other.min = values.min()
+        other.max = values.max()
+        other.histogram, _ = np.histogram(values, self.bins)
+        other.below = int(np.sum(values < self.bins[0]))
+        other.above = int(np.sum(values > self.bins[-1]))
+        self.merge(other)
+
+    def merge(self, other):
+        """Combines the statistics of another RunningStats with the same bins into this one."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+        self.below += other.below
+        self.above += other.above
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def as_dict(self):
+        return {"count": self.count, "mean": self.mean if self.count else np.nan, "std": self.std,
+                "min": self.min if self.count else np.nan, "max": self.max if self.count else np.nan,
+                "bins": self.bins, "histogram": self.histogram, "below": self.below, "above": self.above}
+
+
+class MonteCarlo:
+    def __init__(self, drone, num_samples, constants_std=0.05, wmax_std=0.03, mass_std=0.05, cg_std=0.005,
+                 inertia_std=0.1, seed=0, chunk_size=1024, workers=1, alpha_bins=None, cost_bins=None, hover_kwargs=None):
+        """Monte Carlo analysis of the hovering capabilities of a drone under manufacturing uncertainty.
+
+           Every sample perturbs the propeller constants, maximum angular velocities, mass, C.G. and inertia tensor
+           of the nominal drone. The effectiveness matrices of a chunk of samples are built at once, and the samples
+           are solved chunk by chunk, optionally in parallel. Only streaming statistics are kept, so the memory use
+           does not grow with the number of samples.
+
+        Args:
+            drone (class): Nominal drone, containing inertial properties and propeller configurations.
+            num_samples (int): Number of samples.
+            constants_std (float, optional): Relative standard deviation of each force and moment constant. Defaults to 0.05.
+            wmax_std (float, optional): Relative standard deviation of each maximum angular velocity. Defaults to 0.03.
+            mass_std (float, optional): Relative standard deviation of the mass. Defaults to 0.05.
+            cg_std (float, optional): Standard deviation of each C.G. coordinate in meters. Defaults to 0.005.
+            inertia_std (float, optional): Relative standard deviation of the inertia about each body axis. The tensor
+                                           is scaled as D @ I @ D with a random diagonal D, which keeps it positive definite.
+                                           Defaults to 0.1.
+            seed (int, optional): Seed of the samples and hover initial guesses. Defaults to 0.
+            chunk_size (int, optional): Number of samples per chunk. Defaults to 1024.
+            workers (int, optional): Number of processes evaluating chunks. Defaults to 1.
+            alpha_bins (ndarray, optional): Histogram bin edges of alpha. Defaults to 100 bins on [0, 10].
+            cost_bins (ndarray, optional): Histogram bin edges of the input cost. Defaults to 100 bins on [0, P].
+            hover_kwargs (dict, optional): Keyword arguments passed to Hover.compute_hover, except the seed,
+                                           which is derived from seed per sample. Defaults to None.
+
+        Raises:
+            ValueError: hover_kwargs contains a seed.
+        """
+        self.loc, self.direction, self.rot, self.constants, self.wmax = prop_arrays(drone.props)
+        self.mass = float(drone.mass)
+        self.cg = np.asarray(drone.cg, dtype=float)
+        self.inertia = np.array([[drone.Ix, drone.Ixy, drone.Ixz],
+                                 [drone.Ixy, drone.Iy, drone.Iyz],
+                                 [drone.Ixz, drone.Iyz, drone.Iz]], dtype=float)
+        self.num_props = len(drone.props)
+
+        self.num_samples = num_samples
+        self.std = {"constants": constants_std, "wmax": wmax_std, "mass": mass_std, "cg": cg_std, "inertia": inertia_std}
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.alpha_bins = np.linspace(0, 10, 101) if alpha_bins is None else np.asarray(alpha_bins, dtype=float)
+        self.cost_bins = np.linspace(0, self.num_props, 101) if cost_bins is None else np.asarray(cost_bins, dtype=float)
+        self.hover_kwargs = hover_kwargs or {}
+        if "seed" in self.hover_kwargs:
+            raise ValueError("Pass the seed of the analysis as seed, not in hover_kwargs")
+        self.num_chunks = -(-num_samples // chunk_size)
+
+        # Nominal solution, used as warm start of every sample
+        nominal = Hover(drone)
+        nominal.compute_hover(seed=seed, **self.hover_kwargs)
+        self.nominal_status = nominal.hover_status
+        self.nominal_eta = nominal.eta
+
+    def sample(self, chunk):
+        """Draws the perturbed properties of the samples in a chunk.
+
+        Returns:
+            tuple: Propeller constants (n, P, 2), maximum angular velocities (n, P), masses (n,),
+                   C.G. locations (n, 3) and inertia tensors (n, 3, 3).
+        """
+        n = min(self.chunk_size, self.num_samples - chunk*self.chunk_size)
+        rng = np.random.default_rng([self.seed, chunk])
+        std = self.std
+
+        constants = self.constants * (1 + std["constants"]*rng.standard_normal((n, self.num_props, 2)))
+        wmax = self.wmax * (1 + std["wmax"]*rng.standard_normal((n, self.num_props)))
+        mass = self.mass * (1 + std["mass"]*rng.standard_normal(n))
+        cg = self.cg + std["cg"]*rng.standard_normal((n, 3))
+        scale = np.sqrt((1 + std["inertia"]*rng.standard_normal((n, 3))).clip(min=0.01))
+        inertia = scale[:, :, np.newaxis] * self.inertia * scale[:, np.newaxis, :]
+        return constants.clip(min=0), wmax.clip(min=0), mass.clip(min=1e-3), cg, inertia
+
+    def evaluate_chunk(self, chunk):
+        """Builds and solves the samples of a chunk.
+
+        Returns:
+            dict: Status counts, and RunningStats of alpha and input cost of the hovering samples.
+        """
+        constants, wmax, mass, cg, inertia = self.sample(chunk)
+        Bf, Bm = effectiveness_matrices(self.loc, self.direction, self.rot, constants, wmax, mass, cg, inertia)
+
+        counts = dict.fromkeys(STATUSES, 0)
+        alpha = np.full(len(mass), np.nan)
+        input_cost = np.full(len(mass), np.nan)
+        for i in range(len(mass)):
+            hover = Hover.from_matrices(Bf[i], Bm[i])
+            hover.warm_eta = self.nominal_eta
+            hover.compute_hover(seed=[self.seed, chunk, i], **self.hover_kwargs)
+            counts[hover.hover_status] += 1
+            if hover.alpha is not None:
+                alpha[i] = hover.alpha
+                input_cost[i] = hover.input_cost
+
+        stats = {"counts": counts, "alpha": RunningStats(self.alpha_bins), "input_cost": RunningStats(self.cost_bins)}
+        stats["alpha"].update(alpha)
+        stats["input_cost"].update(input_cost)
+        return stats
+
+    def run(self, verbose=False):
+        """Evaluates all samples and combines the statistics of the chunks.
+
+        Returns:
+            dict: Number of samples, probability and standard error of each hover status, and statistics
+                  (count, mean, std, min, max and histogram) of alpha and input cost over the hovering samples.
+        """
+        counts = dict.fromkeys(STATUSES, 0)
+        alpha = RunningStats(self.alpha_bins)
+        input_cost = RunningStats(self.cost_bins)
+
+        def combine(stats):
+            for status in STATUSES:
+                counts[status] += stats["counts"][status]
+            alpha.merge(stats["alpha"])
+            input_cost.merge(stats["input_cost"])
+
+        done = 0
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # Keep a bounded number of chunks in flight
+                chunks = iter(range(self.num_chunks))
+                running = set()
+                while True:
+                    for chunk in chunks:
+                        running.add(pool.submit(self.evaluate_chunk, chunk))
+                        if len(running) >= 2*self.workers:
+                            break
+                    if not running:
+                        break
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        combine(future.result())
+                        done += 1
+                        if verbose:
+                            print(f"{done}/{self.num_chunks} chunks done")
+        else:
+            for chunk in range(self.num_chunks):
+                combine(self.evaluate_chunk(chunk))
+                done += 1
+                if verbose:
+                    print(f"{done}/{self.num_chunks} chunks done")
+
+        total = sum(counts.values())
+        probability = {status: counts[status]/total for status in STATUSES}
+        return {"samples": total,
+                "nominal_status": self.nominal_status,
+                "probability": probability,
+                "standard_error": {status: np.sqrt(p*(1 - p)/total) for status, p in probability.items()},
+                "alpha": alpha.as_dict(),
+                "input_cost": input_cost.as_dict()}
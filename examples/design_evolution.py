@@ -0,0 +1,12 @@
+from dronehover.design import EvolutionaryDesigner
+
+if __name__ == "__main__":
+    # Search hexacopter layouts that hover statically with high thrust to weight and low input cost
+    designer = EvolutionaryDesigner(num_props=6, population=48, seed=0, workers=4)
+    best = designer.run(generations=20, verbose=True)
+
+    print(f"Best fitness: {best['fitness']:.4f}")
+    print(f"Max thrust to weight: {best['alpha']:.2f}")
+    print(f"Input cost: {best['input_cost']:.5f}")
+    for prop in best["drone"].props:
+        print(prop["loc"], prop["dir"])
@@ -0,0 +1,19 @@
+import numpy as np
+
+from dronehover.bodies.standard_bodies import Quadcopter
+
+from dronehover.optimization import BatchHover
+
+if __name__ == "__main__":
+    # Import drone bodies with varying arm lengths
+    drones = [Quadcopter(length) for length in np.linspace(0.08, 0.30, 12)]
+
+    # Define batch hovering optimizer for all drones
+    sim = BatchHover.from_drones(drones)
+    
+    # Compute most efficient hover for every drone
+    results = sim.compute_hover()
+
+    print(f"Hover status: {results['status']}")
+    print(f"Max thrust to weight: {results['alpha']}")
+    print(f"Input cost: {results['input_cost']}")
@@ -0,0 +1,34 @@
+import numpy as np
+from numpy import sin, cos, pi
+
+from dronehover.bodies.custom_bodies import Custombody
+
+from dronehover.sweep import Sweep
+
+
+def build(length, tilt, offset):
+    """Quadcopter with radially tilted propellers and arms mounted at an offset from the centre"""
+    props = []
+    mountpoints = []
+    for i, spin in enumerate(["ccw", "cw", "ccw", "cw"]):
+        psi = (2*i + 1)/4*pi
+        props.append({"loc": [length*cos(psi), length*sin(psi), 0],
+                      "dir": [sin(tilt)*cos(psi), sin(tilt)*sin(psi), -cos(tilt), spin],
+                      "propsize": 5})
+        mountpoints.append(np.array([offset*cos(psi), offset*sin(psi), 0]))
+    return Custombody(props, mountpoints)
+
+
+if __name__ == "__main__":
+    space = {"length": np.linspace(0.08, 0.3, 12),
+             "tilt": np.radians(np.linspace(0, 60, 13)),
+             "offset": [0.0, 0.02, 0.04]}
+    
+    # Results are streamed to sweep_output/, rerunning resumes an interrupted sweep
+    sweep = Sweep(space, build, "sweep_output", chunk_size=64, workers=4)
+    results = sweep.run(verbose=True)
+
+    print(f"Static hover: {np.mean(results['status'] == 'ST'):.2f}")
+    best = np.nanargmax(results["alpha"])
+    print(f"Best design: length={results['param_length'][best]:.3f}, tilt={np.degrees(results['param_tilt'][best]):.1f}, "
+          f"offset={results['param_offset'][best]:.2f}, alpha={results['alpha'][best]:.2f}")
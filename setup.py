@@ -7,5 +7,8 @@ setuptools.setup(
     author="Elijah Ang",
     author_email="e.h.w.ang@tudelft.nl",
     packages=setuptools.find_packages(),
+    package_data={"dronehover": ["data/*.csv"]},
     install_requires=["numpy", "scipy"],
+    entry_points={"console_scripts": ["dronehover=dronehover.cli:main",
+                                    "dronehover-service=dronehover.service:main"]},
 )
\ No newline at end of file